@@ -0,0 +1,14 @@
+import matplotlib.pyplot as plt
+
+
+# Tracés de main.py (option --plot). Ce module n'est importé qu'à la demande,
+# pour qu'une résolution sans tracé ne charge pas matplotlib.
+
+# Coût des solutions acceptées au fil des itérations
+def convergence(result):
+    result.plot_convergence()
+    plt.title("Convergence")
+
+
+def afficher():
+    plt.show()
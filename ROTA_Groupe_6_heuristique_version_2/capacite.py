@@ -0,0 +1,91 @@
+# Capacités restantes d'une solution :
+#   - créneaux du hub encore libres à chaque instant (slots[t] moins les départs à t) ;
+#   - vols encore autorisés vers chaque destination (n_flights moins les vols planifiés).
+# Réserver ou libérer un vol coûte O(1) ; un arbre binaire sur les instants
+# (une feuille vaut 1 s'il reste un créneau) donne le prochain instant libre
+# à partir de t en O(log T). L'arbre n'est touché que lorsqu'un instant
+# passe de plein à libre ou l'inverse.
+class CapacityLedger:
+    def __init__(self, ctx, solution=()):
+        self.ctx = ctx
+        self.creneaux = ctx.slots[:]
+        self.vols_restants = [destination["n_flights"] for destination in ctx.donnees["destinations"]]
+        self.taille = 1
+        while self.taille < len(self.creneaux):
+            self.taille *= 2
+        self.arbre = [0] * (2 * self.taille)
+        for vol in solution:
+            self.vols_restants[ctx.destination[vol[1]]] -= 1
+            if 0 <= vol[2] < len(self.creneaux):
+                self.creneaux[vol[2]] -= 1
+        for t, restants in enumerate(self.creneaux):
+            self.arbre[self.taille + t] = int(restants > 0)
+        for i in range(self.taille - 1, 0, -1):
+            self.arbre[i] = self.arbre[2 * i] | self.arbre[2 * i + 1]
+
+    def copy(self):
+        copie = CapacityLedger.__new__(CapacityLedger)
+        copie.ctx, copie.taille = self.ctx, self.taille
+        copie.creneaux, copie.vols_restants, copie.arbre = self.creneaux[:], self.vols_restants[:], self.arbre[:]
+        return copie
+
+    def _marquer(self, t, libre):
+        i = self.taille + t
+        self.arbre[i] = libre
+        i //= 2
+        while i and self.arbre[i] != (self.arbre[2 * i] | self.arbre[2 * i + 1]):
+            self.arbre[i] ^= 1
+            i //= 2
+
+    def reserver(self, id_vol, t):
+        self.vols_restants[self.ctx.destination[id_vol]] -= 1
+        if 0 <= t < len(self.creneaux):
+            self.creneaux[t] -= 1
+            if self.creneaux[t] == 0:
+                self._marquer(t, 0)
+
+    def liberer(self, id_vol, t):
+        self.vols_restants[self.ctx.destination[id_vol]] += 1
+        if 0 <= t < len(self.creneaux):
+            self.creneaux[t] += 1
+            if self.creneaux[t] == 1:
+                self._marquer(t, 1)
+
+    def creneau_libre(self, t):
+        return 0 <= t < len(self.creneaux) and self.creneaux[t] > 0
+
+    def destination_ouverte(self, id_vol):
+        return self.vols_restants[self.ctx.destination[id_vol]] > 0
+
+    def disponible(self, id_vol, t, libere=None):
+        # Le vol peut partir à t : il reste un créneau au hub et un vol vers sa
+        # destination. Si `libere` est donné, ce vol planifié est compté comme
+        # déjà retiré (mouvement évalué avant d'être appliqué).
+        if libere is None:
+            return self.creneau_libre(t) and self.destination_ouverte(id_vol)
+        destination = self.ctx.destination
+        return ((self.creneau_libre(t) or t == libere[2])
+                and (self.destination_ouverte(id_vol) or destination[id_vol] == destination[libere[1]]))
+
+    def prochain_creneau(self, t, libere=None):
+        # Premier instant >= t ayant encore un créneau libre, ou None ; avec
+        # `libere`, le créneau de ce vol planifié est compté comme libre
+        if libere is not None:
+            suivant = self.prochain_creneau(t)
+            if t <= libere[2] < len(self.creneaux) and (suivant is None or libere[2] < suivant):
+                return libere[2]
+            return suivant
+        if t >= len(self.creneaux):
+            return None
+        i = self.taille + max(t, 0)
+        if self.arbre[i]:
+            return i - self.taille
+        # Remontée jusqu'au premier sous-arbre droit non vide, puis descente à gauche
+        while i > 1:
+            if i % 2 == 0 and self.arbre[i + 1]:
+                i += 1
+                while i < self.taille:
+                    i = 2 * i if self.arbre[2 * i] else 2 * i + 1
+                return i - self.taille
+            i //= 2
+        return None
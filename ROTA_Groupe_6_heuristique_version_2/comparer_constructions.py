@@ -0,0 +1,51 @@
+import argparse
+import os
+import time
+
+from contexte import charger_contexte
+from evaluation import evaluate_batch, solutions_en_csr
+from main import FlightPlanningModel
+
+
+# Comparaison des solutions initiales proposées à FlightPlanningModel.initial :
+# score (au sens de fonction_evaluation), nombre de vols et temps de construction.
+# Les solutions d'une même instance sont évaluées ensemble par evaluate_batch.
+def comparer(fichiers, constructions, lambda_esp=20, lambda_util=20):
+    resultats = {}
+    for fichier in fichiers:
+        ctx = charger_contexte(fichier)
+        solutions, durees = [], []
+        for construction in constructions:
+            modele = FlightPlanningModel(ctx, lambda_esp, lambda_util, construction=construction)
+            debut = time.perf_counter()
+            initial = modele.initial()
+            durees.append(time.perf_counter() - debut)
+            solutions.append(initial.x.solution[:])
+        lignes, indptr = solutions_en_csr(solutions)
+        scores = evaluate_batch(ctx, lignes, lambda_esp, lambda_util, indptr)[0]
+        for construction, score, solution, duree in zip(constructions, scores, solutions, durees):
+            resultats[fichier, construction] = float(score), len(solution), duree
+    return resultats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare les constructions de solution initiale.")
+    parser.add_argument("instances", nargs="*", help="fichiers d'instance (défaut : tout le dossier Instances)")
+    parser.add_argument("--constructions", nargs="+", default=["glouton", "regret", "intervalles"],
+                        choices=["glouton", "regret", "intervalles", "relaxation", "grasp"])
+    args = parser.parse_args()
+
+    fichiers = args.instances or sorted(os.path.join("Instances", nom) for nom in os.listdir("Instances")
+                                        if nom.endswith(".json"))
+    resultats = comparer(fichiers, args.constructions)
+
+    print(f"{'instance':30s}" + "".join(f"{construction:>28s}" for construction in args.constructions))
+    totaux = dict.fromkeys(args.constructions, 0)
+    for fichier in fichiers:
+        ligne = f"{os.path.basename(fichier):30s}"
+        for construction in args.constructions:
+            score, n_vols, duree = resultats[fichier, construction]
+            totaux[construction] += score
+            ligne += f"{score:12.1f} ({n_vols:3d} vols) {duree * 1000:6.0f} ms"
+        print(ligne)
+    print(f"{'total':30s}" + "".join(f"{totaux[construction]:12.1f}{'':16s}" for construction in args.constructions))
@@ -0,0 +1,70 @@
+import numpy as np
+
+from heuristique import charger_donnees, creer_vols
+
+
+# Contexte d'une instance, construit une seule fois : toutes les tables
+# dont ont besoin l'évaluation, la construction gloutonne et les voisinages.
+# Les colonnes sont indexées directement par l'identifiant du vol (les
+# identifiants commencent à 1, la case 0 n'est pas utilisée).
+class ProblemContext:
+    def __init__(self, donnees):
+        self.donnees = donnees
+        self.n_destinations = len(donnees["destinations"])
+        self.n_avions = donnees["n_aircraft"]
+        self.Tmax = donnees["time_horizon_len"]
+        self.min_spacing = donnees["min_spacing"]
+        self.min_utilisation = donnees["min_utilisation"]
+        self.slots = donnees["slots"]
+
+        # Liste des vols au format historique (dictionnaires)
+        self.vols = creer_vols(donnees)
+        self.n_vols = len(self.vols)
+
+        # Colonnes : identifiant du vol -> destination, départ, profit, durée
+        self.destination = [None] * (self.n_vols + 1)
+        self.instant = [None] * (self.n_vols + 1)
+        self.profit = [0] * (self.n_vols + 1)
+        self.duree = [0] * (self.n_vols + 1)
+
+        # Index : vols par destination et vols par instant de départ
+        self.vols_par_destination = [[] for _ in range(self.n_destinations)]
+        self.vols_par_instant = [[] for _ in range(self.Tmax)]
+
+        for vol in self.vols:
+            id_vol = vol["vol"]
+            self.destination[id_vol] = vol["destination"]
+            self.instant[id_vol] = vol["time"]
+            self.profit[id_vol] = vol["profit"]
+            self.duree[id_vol] = vol["flight_time"]
+            self.vols_par_destination[vol["destination"]].append(id_vol)
+            if vol["time"] < self.Tmax:
+                self.vols_par_instant[vol["time"]].append(id_vol)
+
+        # Profits en entiers exacts (profit = profit_entier / echelle_profit) :
+        # les sommes tenues de façon incrémentale restent alors indépendantes
+        # de l'ordre des ajouts et retraits.
+        self.echelle_profit = max((float(p).as_integer_ratio()[1] for p in self.profit[1:]), default=1)
+        self.profit_entier = [int(p * self.echelle_profit) for p in self.profit]
+
+        # Mêmes colonnes en tableaux NumPy, pour l'évaluation vectorielle
+        self.np_destination = np.array([-1] + self.destination[1:], dtype=np.int64)
+        self.np_duree = np.array(self.duree, dtype=np.int64)
+        self.np_profit = np.array(self.profit)
+
+        # Pénalité de sous-utilisation selon le temps de vol d'un avion,
+        # arrondie comme dans violation_utilisation (0 au-delà du minimum)
+        utilisation_min = self.min_utilisation * self.Tmax
+        self.penalite_par_utilisation = np.array(
+            [round(utilisation_min - u, 2) for u in range(int(utilisation_min) + 1) if u < utilisation_min] + [0.0])
+
+        # Vols triés par profit décroissant (même ordre que sorted(vols, ..., reverse=True))
+        self.vols_par_profit = sorted(range(1, self.n_vols + 1), key=lambda i: self.profit[i], reverse=True)
+
+    def id_vol(self, destination, t):
+        # Identifiant du vol vers `destination` partant à l'instant t
+        return self.vols_par_destination[destination][t]
+
+
+def charger_contexte(fichier):
+    return ProblemContext(charger_donnees(fichier))
@@ -0,0 +1,52 @@
+import os
+import sys
+import tempfile
+
+from contexte import ProblemContext
+from valider import lire_solution, verifier_contraintes
+
+# Contrôle de non-régression de valider.py sur une petite instance construite
+# ici : chaque cas est un fichier solution au format "vol" (avion id_vol
+# départ) et les lignes qui doivent être signalées. Échoue (code de retour 1)
+# si une violation attendue manque ou si une ligne correcte est signalée.
+
+T = 200
+DONNEES = {
+    "n_aircraft": 2,
+    "time_horizon_len": T,
+    "min_utilisation": 0,
+    "min_spacing": 10,
+    "slots": [3] * T,
+    "destinations": [{"n_flights": 5, "flight_time": duree, "profit": [1] * T} for duree in (81, 50, 51)],
+}
+
+
+def vol(destination, t, avion=0):
+    return f"{avion} {destination * T + t + 1} {t}"
+
+
+CAS = {
+    # Le troisième départ chevauche le premier vol, plus long, et pas seulement le deuxième
+    "chevauchement emboîté": ([vol(0, 0), vol(1, 10), vol(2, 62)], {2, 3}),
+    # Un identifiant ne peut partir qu'à son propre instant
+    "départ décalé": ([f"0 {T + 10 + 1} 12"], {1}),
+    # Espacement au sens du score : arrivée du premier (50) et départ du second (55)
+    "espacement arrivée-départ": ([vol(1, 0), vol(1, 55, avion=1)], {1}),
+    "espacement respecté": ([vol(1, 0), vol(1, 60, avion=1)], set()),
+}
+
+
+if __name__ == "__main__":
+    ctx = ProblemContext(DONNEES)
+    echecs = 0
+    with tempfile.TemporaryDirectory() as dossier:
+        for nom, (lignes, attendues) in CAS.items():
+            chemin = os.path.join(dossier, "cas.txt")
+            with open(chemin, "w") as f:
+                f.write("\n".join(lignes) + "\n")
+            vols, erreurs = lire_solution(chemin, ctx, "vol")
+            signalees = {numero for numero, _ in erreurs + verifier_contraintes(vols, ctx)}
+            etat = "OK" if signalees == attendues else "ÉCHEC"
+            echecs += signalees != attendues
+            print(f"{nom:30s} lignes signalées {sorted(signalees)}, attendues {sorted(attendues)} -> {etat}")
+    sys.exit(1 if echecs else 0)
@@ -0,0 +1,65 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+# Mesure du coût de démarrage d'une résolution sans tracé (lot.py, ou main.py
+# sans --plot) : chaque mesure lance un processus neuf, qui importe main puis
+# résout une instance. Échoue (code de retour 1) si la résolution a importé
+# matplotlib, ou pulp hors construction par relaxation.
+
+DOSSIER = os.path.dirname(os.path.abspath(__file__))
+
+# Exécuté dans le processus fils : temps d'import, temps de résolution et
+# modules lourds chargés, en JSON sur la dernière ligne de la sortie
+FILS = """
+import contextlib, io, json, sys, time
+debut = time.perf_counter()
+sys.path.insert(0, {dossier!r})
+import main
+import_main = time.perf_counter() - debut
+with contextlib.redirect_stdout(io.StringIO()):
+    main.resoudre({fichier!r}, {temps}, {construction!r})
+print(json.dumps({{"import": import_main, "resolution": time.perf_counter() - debut - import_main,
+                  "modules": [m for m in ("matplotlib", "pulp") if m in sys.modules]}}))
+"""
+
+
+def mesurer(code, dossier):
+    debut = time.perf_counter()
+    sortie = subprocess.run([sys.executable, "-c", code], cwd=dossier, capture_output=True, text=True, check=True)
+    return time.perf_counter() - debut, sortie.stdout.strip().splitlines()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mesure le démarrage d'une résolution sans affichage graphique.")
+    parser.add_argument("instance", nargs="?", default=os.path.join(DOSSIER, "Instances", "toy_instance.json"))
+    parser.add_argument("--temps", type=int, default=1, help="limite de temps de la résolution (s)")
+    parser.add_argument("--construction", default="glouton",
+                        choices=["glouton", "regret", "intervalles", "relaxation", "grasp"])
+    parser.add_argument("--repetitions", type=int, default=3)
+    args = parser.parse_args()
+
+    interdits = {"matplotlib"} | ({"pulp"} if args.construction != "relaxation" else set())
+    code = FILS.format(dossier=DOSSIER, fichier=os.path.abspath(args.instance), temps=args.temps,
+                       construction=args.construction)
+    # Dans un dossier temporaire : la solution sauvegardée n'écrase rien
+    with tempfile.TemporaryDirectory() as dossier:
+        reference, _ = min(mesurer("import matplotlib.pyplot", dossier) for _ in range(args.repetitions))
+        mesures = [mesurer(code, dossier) for _ in range(args.repetitions)]
+
+    charges = set()
+    for total, lignes in mesures:
+        detail = json.loads(lignes[-1])
+        charges.update(detail["modules"])
+        print(f"processus {total * 1000:7.0f} ms | import main {detail['import'] * 1000:6.0f} ms"
+              f" | résolution {detail['resolution'] * 1000:7.0f} ms | modules : {', '.join(detail['modules']) or '-'}")
+    print(f"référence : processus important matplotlib.pyplot seul, {reference * 1000:.0f} ms")
+
+    if charges & interdits:
+        print(f"ÉCHEC : la résolution sans tracé a importé {', '.join(sorted(charges & interdits))}")
+        sys.exit(1)
+    print("OK : aucune dépendance graphique ou MILP importée")
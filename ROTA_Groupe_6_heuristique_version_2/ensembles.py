@@ -0,0 +1,120 @@
+import random
+
+
+# Éléments d'une séquence dans un ordre aléatoire uniforme, tirés
+# paresseusement sans la copier (Fisher-Yates partiel sur les rangs, dont
+# seuls les échanges sont notés) : on ne paie que les éléments examinés.
+# La séquence ne doit pas être modifiée pendant le parcours.
+def aleatoires(sequence):
+    n = len(sequence)
+    echanges = {}
+    for i in range(n):
+        j = random.randrange(i, n)
+        yield sequence[echanges.get(j, j)]
+        echanges[j] = echanges.get(i, i)
+
+
+# Ensemble d'identifiants de vols tiré au hasard en O(1) : les identifiants
+# sont rangés dans un tableau, et leur rang dans une table indexée par
+# identifiant. Un retrait échange le vol avec le dernier du tableau.
+class FlightPool:
+    def __init__(self, ctx, ids=()):
+        self.ctx = ctx
+        self.ids = []
+        self.rangs = [-1] * (ctx.n_vols + 1)  # identifiant -> rang dans self.ids (-1 : absent)
+        # Borne des poids pour le tirage pondéré par le profit
+        self.poids_max = max(ctx.profit_entier[1:], default=0)
+        for id_vol in ids:
+            self.ajouter(id_vol)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, id_vol):
+        return self.rangs[id_vol] >= 0
+
+    def __iter__(self):
+        return iter(self.ids)
+
+    def ajouter(self, id_vol):
+        if self.rangs[id_vol] < 0:
+            self.rangs[id_vol] = len(self.ids)
+            self.ids.append(id_vol)
+
+    def retirer(self, id_vol):
+        i = self.rangs[id_vol]
+        if i < 0:
+            return
+        dernier = self.ids.pop()
+        if dernier != id_vol:
+            self.ids[i] = dernier
+            self.rangs[dernier] = i
+        self.rangs[id_vol] = -1
+
+    def tirage(self):
+        # Vol tiré uniformément (None si l'ensemble est vide)
+        return random.choice(self.ids) if self.ids else None
+
+    def tirage_pondere(self):
+        # Vol tiré avec une probabilité proportionnelle à son profit, par rejet :
+        # un tirage uniforme est gardé avec probabilité profit / profit maximal.
+        # Nombre moyen d'essais : profit maximal / profit moyen de l'ensemble.
+        if not self.ids:
+            return None
+        if self.poids_max <= 0:
+            return self.tirage()
+        profits = self.ctx.profit_entier
+        while True:
+            id_vol = random.choice(self.ids)
+            if random.random() * self.poids_max < profits[id_vol]:
+                return id_vol
+
+    def aleatoires(self):
+        # Parcours paresseux dans un ordre aléatoire uniforme (Fisher-Yates
+        # partiel sur le tableau lui-même) : on ne paie que les vols examinés.
+        # L'ensemble ne doit pas être modifié pendant le parcours.
+        ids, rangs = self.ids, self.rangs
+        n = len(ids)
+        for i in range(n):
+            j = random.randrange(i, n)
+            ids[i], ids[j] = ids[j], ids[i]
+            rangs[ids[i]], rangs[ids[j]] = i, j
+            yield ids[i]
+
+
+# Bits "ne pas regarder" des vols planifiés d'un Schedule. Un vol reçoit son
+# bit quand son dernier examen exhaustif (meilleur_decalage, voisinage_9 en
+# meilleure amélioration) n'a trouvé aucune amélioration ; le bit tombe dès
+# qu'un mouvement validé touche le vol ou un de ses voisins : les vols de son
+# avion, dont l'utilisation a changé, et ceux de sa destination assez proches
+# pour que l'espacement ait changé.
+class DontLookBits:
+    def __init__(self, programme):
+        self.programme = programme
+        self.vols = set()
+
+    def __len__(self):
+        return len(self.vols)
+
+    def signaler(self, vol):
+        # Le vol vient d'être inséré ou retiré par un mouvement validé. Ses
+        # voisins sont lus dans les index du programme (par avion, et par
+        # destination autour de son départ), sans parcourir la solution.
+        if not self.vols:
+            return
+        programme, ctx = self.programme, self.programme.ctx
+        avion, id_vol, t = vol
+        portee = ctx.duree[id_vol] + ctx.min_spacing
+        voisins = programme.vols_avion(avion)
+        for autre_t, autre_id in programme.index.fenetre(ctx.destination[id_vol], t - portee, t + portee):
+            if autre_t != t or autre_id != id_vol:
+                voisins += programme.vols_partant(autre_id, autre_t)
+        self.vols.difference_update(voisins)
+        self.vols.discard(vol)
+
+    def regarder(self, vol):
+        return vol not in self.vols
+
+    def marquer(self, vol):
+        # Examen exhaustif du vol sans amélioration
+        self.vols.add(vol)
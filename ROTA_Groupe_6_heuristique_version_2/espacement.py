@@ -0,0 +1,80 @@
+from bisect import bisect_left, bisect_right
+
+
+# Départs triés par groupe (destination, avion...), avec l'identifiant associé
+# à chaque départ. Les recherches dans une fenêtre de temps se font par
+# dichotomie en O(log n).
+class DepartureIndex:
+    def __init__(self, n_groupes):
+        self.departs = [[] for _ in range(n_groupes)]
+        self.ids = [[] for _ in range(n_groupes)]
+
+    def ajouter(self, groupe, t, id_vol):
+        departs = self.departs[groupe]
+        i = bisect_right(departs, t)
+        departs.insert(i, t)
+        self.ids[groupe].insert(i, id_vol)
+
+    def retirer(self, groupe, t, id_vol):
+        departs, ids = self.departs[groupe], self.ids[groupe]
+        i = bisect_left(departs, t)
+        while ids[i] != id_vol:  # départs égaux : on cherche le bon identifiant
+            i += 1
+        del departs[i]
+        del ids[i]
+
+    def fenetre(self, groupe, debut, fin):
+        # Départs (t, id) strictement compris entre debut et fin
+        departs = self.departs[groupe]
+        i, j = bisect_right(departs, debut), bisect_left(departs, fin)
+        return zip(departs[i:j], self.ids[groupe][i:j])
+
+
+# Index des départs par destination pour la contrainte d'espacement.
+# Reprend exactement la comparaison de violation_espacement : le vol (id, t)
+# est en conflit avec un autre vol de la même destination partant à t' si
+# |t + flight_time - t'| < min_spacing.
+class SpacingIndex(DepartureIndex):
+    def __init__(self, ctx, solution=()):
+        super().__init__(ctx.n_destinations)
+        self.ctx = ctx
+        for vol in solution:
+            self.ajouter_vol(vol)
+
+    def ajouter_vol(self, vol):
+        self.ajouter(self.ctx.destination[vol[1]], vol[2], vol[1])
+
+    def retirer_vol(self, vol):
+        self.retirer(self.ctx.destination[vol[1]], vol[2], vol[1])
+
+    def voisins(self, id_vol, t):
+        # Vols de la même destination à moins de min_spacing de l'arrivée du vol
+        arrivee = t + self.ctx.duree[id_vol]
+        s = self.ctx.min_spacing
+        for autre_t, autre_id in self.fenetre(self.ctx.destination[id_vol], arrivee - s, arrivee + s):
+            if autre_id != id_vol:
+                yield autre_t, autre_id
+
+    def en_conflit(self, id_vol, t, libere=None):
+        # Avec `libere`, ce vol planifié est compté comme déjà retiré
+        if libere is None:
+            return any(True for _ in self.voisins(id_vol, t))
+        return any((autre_t, autre_id) != (libere[2], libere[1]) for autre_t, autre_id in self.voisins(id_vol, t))
+
+    def violation(self, id_vol, t):
+        # Même valeur que violation_espacement((k, id_vol, t), ctx, solution)
+        arrivee = t + self.ctx.duree[id_vol]
+        s = self.ctx.min_spacing
+        return sum(s - abs(arrivee - autre_t) for autre_t, _ in self.voisins(id_vol, t))
+
+    def penalite(self, id_vol, t):
+        # Pénalité totale apportée par le vol : ses propres violations et
+        # celles qu'il provoque chez les autres vols de la destination
+        ctx = self.ctx
+        duree = ctx.duree[id_vol]
+        s = ctx.min_spacing
+        penalite = self.violation(id_vol, t)
+        for autre_t, autre_id in self.fenetre(ctx.destination[id_vol], t - duree - s, t - duree + s):
+            if autre_id != id_vol:
+                penalite += s - abs(autre_t + duree - t)
+        return penalite
@@ -0,0 +1,215 @@
+import numpy as np
+
+from espacement import SpacingIndex
+
+
+# Évaluation incrémentale de fonction_evaluation.
+# On tient à jour le profit, la pénalité d'espacement (avec les vols de chaque
+# destination) et le temps d'utilisation de chaque avion : retirer ou insérer
+# un vol ne coûte qu'une recherche dans l'index des départs de sa destination.
+class IncrementalEvaluator:
+    def __init__(self, ctx, lambda_espacement, lambda_utilisation, solution=()):
+        self.ctx = ctx
+        self.lambda_espacement = lambda_espacement
+        self.lambda_utilisation = lambda_utilisation
+        self.utilisation_min = ctx.min_utilisation * ctx.Tmax
+        self.charger(solution)
+
+    def charger(self, solution):
+        ctx = self.ctx
+        self.profit_entier = 0
+        self.penalite_espacement = 0
+        self.index = SpacingIndex(ctx)  # départs triés par destination
+        self.utilisation = [0] * ctx.n_avions
+        for vol in solution:
+            self.inserer(vol)
+
+    def inserer(self, vol):
+        avion, id_vol, t = vol
+        ctx = self.ctx
+        self.penalite_espacement += self.index.penalite(id_vol, t)
+        self.index.ajouter_vol(vol)
+        self.profit_entier += ctx.profit_entier[id_vol]
+        self.utilisation[avion] += ctx.duree[id_vol]
+
+    def retirer(self, vol):
+        avion, id_vol, t = vol
+        ctx = self.ctx
+        self.index.retirer_vol(vol)
+        self.penalite_espacement -= self.index.penalite(id_vol, t)
+        self.profit_entier -= ctx.profit_entier[id_vol]
+        self.utilisation[avion] -= ctx.duree[id_vol]
+
+    @property
+    def profit_total(self):
+        return self.profit_entier / self.ctx.echelle_profit
+
+    def penalite_avion(self, temps):
+        # Même calcul (et même arrondi) que violation_utilisation pour un avion
+        return round(self.utilisation_min - temps, 2) if temps < self.utilisation_min else 0
+
+    @property
+    def penalite_utilisation(self):
+        return sum(self.penalite_avion(temps) for temps in self.utilisation)
+
+    @property
+    def score(self):
+        return (self.profit_total - self.lambda_espacement * self.penalite_espacement
+                - self.lambda_utilisation * self.penalite_utilisation)
+
+    def evaluation(self):
+        # Même tuple que fonction_evaluation
+        return self.score, self.profit_total, self.penalite_espacement, self.penalite_utilisation
+
+    def score_apres(self, retraits=(), insertions=()):
+        # Score de la solution obtenue en retirant puis insérant les vols donnés,
+        # sans modifier l'état courant
+        for vol in retraits:
+            self.retirer(vol)
+        for vol in insertions:
+            self.inserer(vol)
+        score = self.score
+        for vol in reversed(insertions):
+            self.retirer(vol)
+        for vol in reversed(retraits):
+            self.inserer(vol)
+        return score
+
+    def delta(self, retraits=(), insertions=()):
+        return self.score_apres(retraits, insertions) - self.score
+
+    def delta_retrait(self, vol):
+        return self.delta(retraits=(vol,))
+
+    def delta_insertion(self, vol):
+        return self.delta(insertions=(vol,))
+
+    def delta_utilisation(self, variations):
+        # Variation du score quand seul le temps de vol des avions change
+        # (avion -> variation) : mêmes vols, mêmes départs, autres avions
+        baisse = 0
+        for avion, variation in variations.items():
+            temps = self.utilisation[avion]
+            baisse += self.penalite_avion(temps) - self.penalite_avion(temps + variation)
+        return self.lambda_utilisation * baisse
+
+    def appliquer(self, retraits=(), insertions=()):
+        for vol in retraits:
+            self.retirer(vol)
+        for vol in insertions:
+            self.inserer(vol)
+
+
+# Pour chaque élément i : somme, sur les éléments j de même clé partant à
+# moins de s de centres[i], de s - |centres[i] - departs[j]|.
+# Les départs sont triés par (clé, départ) puis chaque fenêtre est lue par
+# dichotomie et sommes préfixes, sans boucle Python.
+def _somme_fenetres(cles, departs, centres, s):
+    if len(departs) == 0:
+        return np.zeros(0, dtype=np.int64)
+    origine = min(departs.min(), centres.min() - s)
+    largeur = max(departs.max(), centres.max() + s) - origine + 1
+    valeurs = np.sort(cles * largeur + (departs - origine))
+    centres = cles * largeur + (centres - origine)
+    cumul = np.concatenate(([0], np.cumsum(valeurs)))
+    debut = np.searchsorted(valeurs, centres - s, side="right")
+    milieu = np.searchsorted(valeurs, centres, side="right")
+    fin = np.searchsorted(valeurs, centres + s, side="left")
+    gauche = (milieu - debut) * (s - centres) + (cumul[milieu] - cumul[debut])
+    droite = (fin - milieu) * (s + centres) - (cumul[fin] - cumul[milieu])
+    return gauche + droite
+
+
+def solution_en_tableaux(solution):
+    tableau = np.array(solution, dtype=np.int64).reshape(-1, 3)
+    return tableau[:, 0], tableau[:, 1], tableau[:, 2]
+
+
+# Évaluation vectorielle d'une solution donnée par ses colonnes (avion, vol, départ).
+# Renvoie exactement le même tuple que fonction_evaluation.
+def evaluer_tableaux(ctx, avions, vols, departs, lambda_espacement, lambda_utilisation, profit_total=None):
+    if profit_total is None:
+        # Somme dans l'ordre de la solution, comme fonction_evaluation
+        profit_total = np.cumsum(ctx.np_profit[vols])[-1].item() if len(vols) else 0
+
+    # Espacement : fenêtres par destination, moins les paires d'un même vol
+    arrivees = departs + ctx.np_duree[vols]
+    s = ctx.min_spacing
+    penalite_espacement = int(_somme_fenetres(ctx.np_destination[vols], departs, arrivees, s).sum()
+                              - _somme_fenetres(vols, departs, arrivees, s).sum())
+
+    # Utilisation : temps de vol cumulé par avion
+    utilisation = np.bincount(avions, weights=ctx.np_duree[vols], minlength=ctx.n_avions)[:ctx.n_avions]
+    utilisation = utilisation.astype(np.int64)
+    table = ctx.penalite_par_utilisation
+    violees = table[np.minimum(utilisation, len(table) - 1)][utilisation < ctx.min_utilisation * ctx.Tmax]
+    penalite_utilisation = np.cumsum(violees)[-1].item() if len(violees) else 0
+
+    score = profit_total - lambda_espacement * penalite_espacement - lambda_utilisation * penalite_utilisation
+    return score, profit_total, penalite_espacement, penalite_utilisation
+
+
+# Même signature que fonction_evaluation, en version vectorielle
+def evaluation_vectorielle(solution, ctx, lambda_espacement, lambda_utilisation, profit_total=None):
+    return evaluer_tableaux(ctx, *solution_en_tableaux(solution), lambda_espacement, lambda_utilisation, profit_total)
+
+
+# Évaluation d'un lot de solutions en une seule passe vectorielle.
+# `solutions` est soit un tableau (B, L, 3) de lignes (avion, vol, départ)
+# complété par des lignes de vol 0, soit un tableau (N, 3) de toutes les
+# lignes mises bout à bout, découpé par `indptr` (format CSR : la solution b
+# occupe les lignes indptr[b] à indptr[b + 1]).
+# Renvoie les tableaux (score, profit, pénalité d'espacement, pénalité
+# d'utilisation), chacun de taille B, avec les mêmes valeurs que fonction_evaluation.
+def evaluate_batch(ctx, solutions, lambda_espacement, lambda_utilisation, indptr=None):
+    solutions = np.asarray(solutions, dtype=np.int64)
+    if indptr is None:
+        n_solutions, longueur = solutions.shape[:2]
+        lignes = solutions.reshape(-1, 3)
+        numeros = np.repeat(np.arange(n_solutions), longueur)
+        positions = np.tile(np.arange(longueur), n_solutions)
+        valides = lignes[:, 1] > 0
+        lignes, numeros, positions = lignes[valides], numeros[valides], positions[valides]
+    else:
+        indptr = np.asarray(indptr, dtype=np.int64)
+        n_solutions = len(indptr) - 1
+        tailles = np.diff(indptr)
+        longueur = tailles.max(initial=0)
+        lignes = solutions.reshape(-1, 3)
+        numeros = np.repeat(np.arange(n_solutions), tailles)
+        positions = np.arange(len(lignes)) - indptr[numeros]
+    avions, vols, departs = lignes[:, 0], lignes[:, 1], lignes[:, 2]
+
+    # Profit : sommes séquentielles dans l'ordre de chaque solution
+    profits = np.zeros((n_solutions, longueur + 1), dtype=ctx.np_profit.dtype)
+    profits[numeros, positions] = ctx.np_profit[vols]
+    profit_total = np.cumsum(profits, axis=1)[:, -1]
+
+    # Espacement : les clés séparent les solutions du lot
+    arrivees = departs + ctx.np_duree[vols]
+    s = ctx.min_spacing
+    par_vol = (_somme_fenetres(numeros * ctx.n_destinations + ctx.np_destination[vols], departs, arrivees, s)
+               - _somme_fenetres(numeros * (ctx.n_vols + 1) + vols, departs, arrivees, s))
+    penalite_espacement = np.bincount(numeros, weights=par_vol, minlength=n_solutions).astype(np.int64)
+
+    # Utilisation : temps de vol par (solution, avion)
+    m = ctx.n_avions
+    dans_flotte = avions < m
+    utilisation = np.bincount(numeros[dans_flotte] * m + avions[dans_flotte],
+                              weights=ctx.np_duree[vols[dans_flotte]], minlength=n_solutions * m)
+    utilisation = utilisation.astype(np.int64).reshape(n_solutions, m)
+    table = ctx.penalite_par_utilisation
+    penalites = np.where(utilisation < ctx.min_utilisation * ctx.Tmax,
+                         table[np.minimum(utilisation, len(table) - 1)], 0.0)
+    penalite_utilisation = np.cumsum(penalites, axis=1)[:, -1] if m else np.zeros(n_solutions)
+
+    score = profit_total - lambda_espacement * penalite_espacement - lambda_utilisation * penalite_utilisation
+    return score, profit_total, penalite_espacement, penalite_utilisation
+
+
+# Met une liste de solutions (listes de triplets) au format CSR de evaluate_batch
+def solutions_en_csr(solutions):
+    indptr = np.zeros(len(solutions) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(solution) for solution in solutions])
+    lignes = [vol for solution in solutions for vol in solution]
+    return np.array(lignes, dtype=np.int64).reshape(-1, 3), indptr
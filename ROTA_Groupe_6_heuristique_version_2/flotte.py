@@ -0,0 +1,135 @@
+import numpy as np
+
+from planning import Planning
+
+
+# Départs t possibles pour une durée donnée sur un avion : bits t tels que
+# la fenêtre [t, t + duree) est libre dans `masque` et tient dans l'horizon.
+def departs_libres(masque, duree, Tmax):
+    if duree > Tmax:
+        return 0
+    occupe, largeur = masque, 1
+    while largeur < duree:  # étalement par doublement : O(log duree) décalages
+        pas = min(largeur, duree - largeur)
+        occupe |= occupe >> pas
+        largeur += pas
+    return ~occupe & ((1 << (Tmax - duree + 1)) - 1)
+
+
+# Planning de la flotte avec un index de disponibilité : pour chaque durée de
+# vol demandée, un arbre (tas binaire sur les avions) dont chaque nœud est le
+# OU des départs libres des avions de son sous-arbre.
+#   - premier_avion(t, duree) : premier avion libre sur [t, t + duree), en O(log m) ;
+#   - departs_possibles(duree) : masque des départs où au moins un avion est libre.
+# Les arbres sont construits à la première demande pour une durée et remis à
+# jour paresseusement pour les seuls avions modifiés depuis.
+class FleetAvailability(Planning):
+    def __init__(self, n_avions, Tmax, masques=None):
+        super().__init__(n_avions, Tmax, masques)
+        self.taille = 1
+        while self.taille < n_avions:
+            self.taille *= 2
+        self._arbres = {}   # durée -> arbre
+        self._modifies = {}  # durée -> avions à remettre à jour dans l'arbre
+
+    def copy(self):
+        copie = FleetAvailability(self.n_avions, self.Tmax, self.masques[:])
+        copie._arbres = {duree: arbre[:] for duree, arbre in self._arbres.items()}
+        copie._modifies = {duree: set(avions) for duree, avions in self._modifies.items()}
+        return copie
+
+    def occuper(self, k, t, duree):
+        super().occuper(k, t, duree)
+        self._signaler(k)
+
+    def liberer(self, k, t, duree):
+        super().liberer(k, t, duree)
+        self._signaler(k)
+
+    def restaurer(self, k, masque):
+        super().restaurer(k, masque)
+        self._signaler(k)
+
+    def _signaler(self, k):
+        for avions in self._modifies.values():
+            avions.add(k)
+
+    def _arbre(self, duree):
+        arbre = self._arbres.get(duree)
+        if arbre is None:
+            arbre = [0] * (2 * self.taille)
+            for k in range(self.n_avions):
+                arbre[self.taille + k] = departs_libres(self.masques[k], duree, self.Tmax)
+            for i in range(self.taille - 1, 0, -1):
+                arbre[i] = arbre[2 * i] | arbre[2 * i + 1]
+            self._arbres[duree] = arbre
+            self._modifies[duree] = set()
+        elif self._modifies[duree]:
+            for k in self._modifies[duree]:
+                i = self.taille + k
+                arbre[i] = departs_libres(self.masques[k], duree, self.Tmax)
+                i //= 2
+                while i:
+                    arbre[i] = arbre[2 * i] | arbre[2 * i + 1]
+                    i //= 2
+            self._modifies[duree].clear()
+        return arbre
+
+    def departs_possibles(self, duree):
+        # Masque des départs t pour lesquels un avion au moins est libre sur [t, t + duree)
+        return self._arbre(duree)[1]
+
+    def premier_avion(self, t, duree, debut=0):
+        # Plus petit avion k >= debut libre sur [t, t + duree), ou None
+        if t < 0:
+            return None
+        arbre = self._arbre(duree)
+        bit = 1 << t
+        return self._chercher(arbre, bit, 1, 0, self.taille, debut)
+
+    def _chercher(self, arbre, bit, i, gauche, droite, debut):
+        if droite <= debut or not arbre[i] & bit:
+            return None
+        if i >= self.taille:
+            return gauche
+        milieu = (gauche + droite) // 2
+        k = self._chercher(arbre, bit, 2 * i, gauche, milieu, debut)
+        if k is None:
+            k = self._chercher(arbre, bit, 2 * i + 1, milieu, droite, debut)
+        return k
+
+    # Variantes pour évaluer un mouvement avant de l'appliquer : l'avion k est
+    # supposé avoir libéré la fenêtre [debut, debut + duree_liberee).
+    def departs_possibles_apres_retrait(self, duree, k, debut, duree_liberee):
+        masque = self.masques[k] & ~self.fenetre(debut, duree_liberee)
+        return self.departs_possibles(duree) | departs_libres(masque, duree, self.Tmax)
+
+    def premier_avion_apres_retrait(self, t, duree, k, debut, duree_liberee):
+        premier = self.premier_avion(t, duree)
+        if premier is not None and premier < k:
+            return premier
+        masque = self.masques[k] & ~self.fenetre(debut, duree_liberee)
+        if t >= 0 and t + duree <= self.Tmax and not masque & self.fenetre(t, duree):
+            return k
+        return premier
+
+    def avions_libres(self, t, duree):
+        # Tous les avions libres sur [t, t + duree), dans l'ordre croissant
+        k = self.premier_avion(t, duree)
+        while k is not None:
+            yield k
+            k = self.premier_avion(t, duree, k + 1)
+
+
+# Instants (bits à 1) d'un masque, dans l'ordre croissant
+def instants(masque):
+    while masque:
+        bas = masque & -masque
+        yield bas.bit_length() - 1
+        masque ^= bas
+
+
+# Masque -> tableau booléen de taille n (bit t -> case t)
+def tableau(masque, n):
+    octets = np.frombuffer(masque.to_bytes((n + 7) // 8, "little"), dtype=np.uint8)
+    return np.unpackbits(octets, bitorder="little")[:n].astype(bool)
@@ -0,0 +1,65 @@
+import numpy as np
+
+from flotte import departs_libres, tableau
+from mouvements import insertion
+
+
+# Gains de toutes les insertions possibles dans un Schedule, calculés d'un
+# bloc. Ligne d * T + t : vol vers la destination d partant à t (identifiant
+# ligne + 1) ; colonne k : avion. Le gain est la variation exacte du score,
+# comme evaluateur.delta_insertion : profit, plus λu fois la baisse de
+# pénalité de sous-utilisation de l'avion, moins λe fois la pénalité
+# d'espacement créée avec les vols planifiés. Les insertions impossibles
+# valent -inf : vol déjà planifié ou arrivant après l'horizon, créneau du hub
+# plein, destination épuisée, avion occupé.
+def gains_insertion(programme, ctx):
+    D, T, m, s = ctx.n_destinations, ctx.Tmax, ctx.n_avions, ctx.min_spacing
+    evaluateur, capacites = programme.evaluateur, programme.capacites
+    instants = np.tile(np.arange(T), D)
+    duree = ctx.np_duree[1:]
+
+    # Masques des vols insérables, avant de regarder les avions
+    possible = np.zeros(D * T, dtype=bool)
+    possible[np.fromiter(programme.non_planifies, dtype=np.int64) - 1] = True
+    possible &= (np.array(capacites.creneaux) > 0)[instants]
+    possible &= np.repeat(np.array(capacites.vols_restants) > 0, T)
+
+    # Avions libres sur [t, t + durée), par destination
+    libre = np.zeros((D * T, m), dtype=bool)
+    for d, destination in enumerate(ctx.donnees["destinations"]):
+        for k, masque in enumerate(programme.planning.masques):
+            libre[d * T:(d + 1) * T, k] = tableau(departs_libres(masque, destination["flight_time"], T), T)
+
+    # Pénalité d'espacement de chaque ligne : chaque vol planifié (e, t', durée)
+    # pénalise les départs vers e autour de t' - durée et de t' + durée
+    penalite = np.zeros(D * T)
+    if programme.solution and s > 0:
+        vols = np.array(programme.solution)
+        destinations = ctx.np_destination[vols[:, 1]]
+        durees = ctx.np_duree[vols[:, 1]]
+        decalages = np.arange(1 - s, s)
+        centres = np.concatenate([vols[:, 2] - durees, vols[:, 2] + durees])[:, None] + decalages
+        lignes = np.tile(destinations, 2)[:, None] * T + centres
+        valeurs = np.broadcast_to(s - np.abs(decalages), centres.shape)
+        dedans = (centres >= 0) & (centres < T)
+        np.add.at(penalite, lignes[dedans], valeurs[dedans])
+
+    # Baisse de pénalité de sous-utilisation de chaque avion
+    table = ctx.penalite_par_utilisation
+    plafond = len(table) - 1
+    utilisation = np.array(evaluateur.utilisation)
+    baisse = table[np.minimum(utilisation, plafond)] - table[np.minimum(utilisation + duree[:, None], plafond)]
+
+    gains = (ctx.np_profit[1:, None] + evaluateur.lambda_utilisation * baisse
+             - evaluateur.lambda_espacement * penalite[:, None])
+    return np.where(libre & possible[:, None], gains, -np.inf)
+
+
+# Meilleure insertion (plus grand gain, premier avion à égalité), ou None si
+# aucune insertion n'améliore le score : optimum local pour l'ajout de vols
+def meilleure_insertion(programme, ctx):
+    gains = gains_insertion(programme, ctx)
+    ligne, k = np.unravel_index(np.argmax(gains), gains.shape)
+    if not gains[ligne, k] > 0:
+        return None
+    return insertion(programme, (int(k), int(ligne) + 1, int(ligne) % ctx.Tmax))
@@ -0,0 +1,108 @@
+import contextlib
+import os
+import random
+
+import numpy as np
+
+from heuristics.optimizers import descent
+from heuristics.stop import MaxIteration
+
+from capacite import CapacityLedger
+from contexte import ProblemContext
+from espacement import SpacingIndex
+from evaluation import evaluate_batch, solutions_en_csr
+from flotte import FleetAvailability
+from ordonnancement import Schedule
+
+
+# Construction gloutonne randomisée (GRASP) : à chaque étape, les `taille_rcl`
+# premiers vols encore planifiables dans l'ordre des profits décroissants
+# forment la liste restreinte de candidats, dans laquelle on tire au hasard.
+# Un vol qui n'est plus planifiable (créneau, destination, espacement, aucun
+# avion libre) ne le redevient jamais : il est retiré définitivement.
+def construire_grasp(ctx, rng, taille_rcl=5):
+    planning = FleetAvailability(ctx.n_avions, ctx.Tmax)
+    capacites = CapacityLedger(ctx)
+    index = SpacingIndex(ctx)
+    candidats = [id_vol for id_vol in ctx.vols_par_profit if ctx.instant[id_vol] + ctx.duree[id_vol] <= ctx.Tmax]
+    solution = []
+    profit_total = 0
+
+    while True:
+        rcl, vivants = [], []
+        for position, id_vol in enumerate(candidats):
+            if len(rcl) == taille_rcl:
+                vivants += candidats[position:]
+                break
+            t, duree = ctx.instant[id_vol], ctx.duree[id_vol]
+            k = planning.premier_avion(t, duree) if capacites.disponible(id_vol, t) else None
+            if k is None or index.en_conflit(id_vol, t):
+                continue
+            vivants.append(id_vol)
+            rcl.append((k, id_vol, t))
+        if not rcl:
+            break
+        candidats = vivants
+
+        vol = rng.choice(rcl)
+        k, id_vol, t = vol
+        planning.occuper(k, t, ctx.duree[id_vol])
+        capacites.reserver(id_vol, t)
+        index.ajouter_vol(vol)
+        solution.append(vol)
+        profit_total += ctx.profit[id_vol]
+        candidats.remove(id_vol)
+
+    return solution, profit_total, planning
+
+
+# État d'un processus de calcul : l'instance n'est chargée qu'une fois par processus
+_modele = None
+_parametres = None
+
+
+def _initialiser(donnees, lambda_esp, lambda_util, iterations, taille_rcl):
+    global _modele, _parametres
+    from main import FlightPlanningModel  # main importe ce module
+    _modele = FlightPlanningModel(ProblemContext(donnees), lambda_esp, lambda_util)
+    _parametres = iterations, taille_rcl
+
+
+# Un départ : construction randomisée puis courte descente, avec sa propre
+# graine. La descente est muette (un seul affichage pour tout le GRASP) ;
+# la solution est rendue sans score, les élites sont évaluées en lot.
+def _depart(graine):
+    iterations, taille_rcl = _parametres
+    ctx = _modele.ctx
+    random.seed(graine)
+    np.random.seed(graine % 2**32)
+    solution, _, planning = construire_grasp(ctx, random.Random(graine), taille_rcl)
+    initial = _modele.candidat(Schedule(ctx, _modele.lambda_esp, _modele.lambda_util, solution, planning))
+    with open(os.devnull, "w") as muet, contextlib.redirect_stdout(muet):
+        etat = descent(initial, _modele.neighbour, MaxIteration(iterations), minimize=False)
+    return etat.best.x[0]
+
+
+# GRASP multi-départs réparti sur un pool de processus. Le nombre de départs
+# ne dépend pas de la machine : `jobs` ne fixe que la taille du pool.
+# Renvoie les `n_elites` meilleures solutions distinctes, sous forme de
+# couples (score, solution), de la meilleure à la moins bonne. Les solutions
+# des départs sont évaluées ensemble par evaluate_batch.
+def grasp(ctx, lambda_esp, lambda_util, n_departs=16, n_elites=5, iterations=2000,
+          taille_rcl=5, graine=0, jobs=None):
+    from concurrent.futures import ProcessPoolExecutor  # multiprocessing, seulement pour ce mode
+    jobs = min(jobs or os.cpu_count(), n_departs)
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_initialiser,
+                             initargs=(ctx.donnees, lambda_esp, lambda_util, iterations, taille_rcl)) as pool:
+        solutions = list(pool.map(_depart, range(graine, graine + n_departs)))
+
+    lignes, indptr = solutions_en_csr(solutions)
+    scores = evaluate_batch(ctx, lignes, lambda_esp, lambda_util, indptr)[0]
+    elites, vues = [], set()
+    for i in np.argsort(-scores, kind="stable"):
+        score, solution = float(scores[i]), solutions[i]
+        cle = frozenset(solution)
+        if cle not in vues:
+            vues.add(cle)
+            elites.append((score, solution))
+    return elites[:n_elites]
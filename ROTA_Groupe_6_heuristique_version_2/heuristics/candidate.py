@@ -9,9 +9,29 @@ on objects `x` of the kind you like, is to simply wrap `x` and `f(x)`:
 ```python
 solution = Candidate(x, f(x))
 ```
+
+When copying `x` at each step is too expensive, the neighbour function can
+instead modify a single shared `x` in place and return an `InPlaceCandidate`,
+which knows how to undo that move. The heuristics then revert rejected moves,
+and only copy `x` when a new best candidate is found:
+```python
+def neighbour(s, state):
+    move = random_move(s.x)
+    move.apply(s.x)
+    return InPlaceCandidate(s.x, f(s.x), undo=lambda: move.undo(s.x))
+```
+
+If the cost of a move can be computed without applying it, a `MoveCandidate`
+goes one step further: the move is only applied once the candidate is
+accepted, so rejected moves never touch `x`:
+```python
+def neighbour(s, state):
+    move = random_move(s.x)
+    return MoveCandidate(s.x, s.cost + move.delta(s.x), apply=lambda: move.apply(s.x))
+```
 '''
 
-from typing import Any
+from typing import Any, Callable
 
 
 class Candidate:
@@ -30,3 +50,78 @@ class Candidate:
 
     def __repr__(self) -> str:
         return f'{self.x} - cost = {self.cost}'
+
+    def commit(self) -> None:
+        '''
+        Make `x` represent this candidate, once it is accepted.
+        Nothing to do here, as `x` already does.
+        '''
+
+    def revert(self) -> None:
+        '''
+        Undo the changes that produced this candidate, once it is rejected.
+        Nothing to do here, as `x` is never shared with another candidate.
+        '''
+
+    def snapshot(self) -> 'Candidate':
+        '''
+        Return a candidate that stays valid whatever happens to the current
+        one later on (used to keep track of the best candidate).
+        '''
+        return self
+
+
+class InPlaceCandidate(Candidate):
+    '''
+    Represents a candidate solution obtained by modifying in place the
+    representation `x` shared with the current candidate.
+    '''
+
+    def __init__(self, x : Any, cost : int | float,
+                 undo : Callable[[], None] | None = None,
+                 copy : Callable[[Any], Any] | None = None) -> None:
+        '''
+        Create a candidate with given shared vector `x` and its `cost`.
+        `undo` reverts the move that produced the candidate (`None` if there
+        is nothing to revert, *e.g.* for an initial solution), and `copy`
+        returns an independent copy of `x` (a shallow copy by default).
+        '''
+        super().__init__(x, cost)
+        self.undo : Callable[[], None] | None = undo
+        '''Function reverting the move that produced the candidate.'''
+        self.copy : Callable[[Any], Any] = copy if copy is not None else lambda x: x.copy()
+        '''Function returning an independent copy of a representation.'''
+
+    def revert(self) -> None:
+        '''Undo the move that produced this candidate.'''
+        if self.undo is not None:
+            self.undo()
+
+    def snapshot(self) -> Candidate:
+        '''Return a plain candidate holding a copy of `x`.'''
+        return Candidate(self.copy(self.x), self.cost)
+
+
+class MoveCandidate(InPlaceCandidate):
+    '''
+    Represents a candidate solution obtained by a move on the representation
+    `x` shared with the current candidate, whose cost is known before the
+    move is applied. The move is only applied by `commit`.
+    '''
+
+    def __init__(self, x : Any, cost : int | float,
+                 apply : Callable[[], None],
+                 copy : Callable[[Any], Any] | None = None) -> None:
+        '''
+        Create a candidate with given shared vector `x` and the `cost` it will
+        have once `apply` has been called. `copy` is as in `InPlaceCandidate`.
+        '''
+        super().__init__(x, cost, None, copy)
+        self.apply : Callable[[], None] | None = apply
+        '''Function applying the move, `None` once it is applied.'''
+
+    def commit(self) -> None:
+        '''Apply the move (only once).'''
+        if self.apply is not None:
+            self.apply()
+            self.apply = None
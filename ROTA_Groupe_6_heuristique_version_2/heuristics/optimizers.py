@@ -11,11 +11,19 @@ the search.
 If you choose the simulated annealing, you will also need to provide a
 temperature profile, *i.e.* a function that returns a temperature (`float`)
 at a given iteration (`int`).
+
+The adaptive large neighbourhood search (`alns`) replaces the neighbour
+function by two lists of operators: destroy operators, which take the current
+solution apart, and repair operators, which rebuild a candidate from the
+result. At each iteration, one of each is drawn with a probability
+proportional to its weight, and the weights follow the observed results.
 '''
 
 import numpy as np
-from typing import Callable
-from .state import State
+from time import perf_counter
+from typing import Any, Callable, Sequence
+from .state import OperatorStats, State
+from .trace import Trace
 from .candidate import Candidate
 from .stop import *
 
@@ -31,7 +39,15 @@ class MonteCarlo:
 
     def step(self, candidate):
         '''@private'''
-        self.state.update(candidate, self.accept(candidate))
+        self.conclude(candidate, self.accept(candidate))
+
+    def conclude(self, candidate, accepted):
+        '''@private'''
+        if accepted:
+            candidate.commit()
+        self.state.update(candidate, accepted)
+        if not accepted:
+            candidate.revert()
 
 
 class Descent(MonteCarlo):
@@ -55,6 +71,66 @@ class SimulatedAnnealing(MonteCarlo):
                 np.exp(-delta / self.temp(self.state.iterations)) > np.random.rand())
 
 
+class ALNS(SimulatedAnnealing):
+    '''@private'''
+
+    def __init__(self, destroy, repair, temp, minimize, reaction, rewards):
+        super().__init__(temp, minimize)
+        self.destroy = list(destroy)
+        self.repair = list(repair)
+        self.reaction = reaction
+        self.rewards = rewards
+        self.used = ()
+
+    def stats(self, operator):
+        name = getattr(operator, '__name__', repr(operator))
+        if name not in self.state.operators:
+            self.state.operators[name] = OperatorStats(name)
+        return self.state.operators[name]
+
+    def draw(self, operators):
+        weights = np.array([self.stats(operator).weight for operator in operators])
+        return operators[np.random.choice(len(operators), p=weights / weights.sum())]
+
+    def neighbour(self, current, state):
+        destroy, repair = self.draw(self.destroy), self.draw(self.repair)
+        start = perf_counter()
+        partial = destroy(current, state)
+        middle = perf_counter()
+        candidate = repair(partial, state)
+        end = perf_counter()
+        self.used = ((self.stats(destroy), middle - start), (self.stats(repair), end - middle))
+        return candidate
+
+    def step(self, candidate):
+        current = self.state.current
+        if current is None:
+            return super().step(candidate)
+        gain = current.cost - candidate.cost
+        if not self.minimize: gain = -gain
+        new_best = self.state.is_better(candidate)
+        accepted = self.accept(candidate)
+        self.conclude(candidate, accepted)
+
+        reward = (self.rewards[0] if new_best else self.rewards[1] if gain > 0
+                  else self.rewards[2] if accepted else 0.)
+        for stats, elapsed in self.used:
+            stats.calls += 1
+            stats.time += elapsed
+            stats.accepted += accepted
+            stats.improved += gain > 0
+            stats.new_best += new_best
+            if accepted: stats.gain += gain
+        # Rewards are scaled by the relative cost of the operators of the same kind
+        for kind in (self.destroy, self.repair):
+            stats = [self.stats(operator) for operator in kind]
+            mean = np.mean([s.mean_time for s in stats])
+            for s, _ in self.used:
+                if s in stats:
+                    cost = s.mean_time / mean if mean > 0 else 1.
+                    s.weight = max((1 - self.reaction) * s.weight + self.reaction * reward / cost, 1e-3)
+
+
 class CleanExit:
     '''@private'''
     def __enter__(self):
@@ -68,10 +144,11 @@ class CleanExit:
 def optimize(initial_candidate : Candidate,
              neighbour : Callable[[Candidate, State], Candidate],
              heuristic : MonteCarlo,
-             stop : Stop | None = None) -> State:
+             stop : Stop | None = None,
+             trace : Callable[[], Trace] = Trace) -> State:
     '''@private'''
     if stop is None: stop = lambda _: False
-    with State(heuristic.minimize) as st:
+    with State(heuristic.minimize, trace) as st:
         with CleanExit():
             heuristic.state = st
             heuristic.step(initial_candidate)
@@ -82,27 +159,62 @@ def optimize(initial_candidate : Candidate,
 def descent(initial : Candidate,
             neighbour : Callable[[Candidate, State], Candidate],
             stop : Stop | None = None,
-            minimize : bool = True) -> State:
+            minimize : bool = True,
+            trace : Callable[[], Trace] = Trace) -> State:
     '''
     Launch a strict descent, starting at `initial` candidate solution,
     using the `neighbour` function to step from one candidate to the next,
     and stopping as indicated by the `stop` criterion
     (if not provided, you will have to interrupt manually with Ctrl+C).
     If you maximize your function, you need to set `minimize = False`.
+    The costs of accepted and best candidates are recorded in traces built by
+    `trace` (see `.trace.Trace` to thin them out on long runs).
     '''
-    return optimize(initial, neighbour, Descent(minimize), stop)
+    return optimize(initial, neighbour, Descent(minimize), stop, trace)
 
 def simulatedannealing(initial : Candidate,
                        neighbour : Callable[[Candidate, State], Candidate],
                        temperature : Callable[[int], float],
                        stop : Stop | None = None,
-                       minimize : bool = True) -> State:
+                       minimize : bool = True,
+                       trace : Callable[[], Trace] = Trace) -> State:
     '''
     Same as `descent`, except it uses a simulated annealing process.
     You have to provide an additional `temperature` function that describes the
     temperature decreasing profile as a function of the number of iterations.
     '''
-    return optimize(initial, neighbour, SimulatedAnnealing(temperature, minimize), stop)
+    return optimize(initial, neighbour, SimulatedAnnealing(temperature, minimize), stop, trace)
+
+
+def alns(initial : Candidate,
+         destroy : Sequence[Callable[[Candidate, State], Any]],
+         repair : Sequence[Callable[[Any, State], Candidate]],
+         temperature : Callable[[int], float],
+         stop : Stop | None = None,
+         minimize : bool = True,
+         reaction : float = 0.1,
+         rewards : tuple[float, float, float] = (10., 4., 1.),
+         trace : Callable[[], Trace] = Trace) -> State:
+    '''
+    Launch an adaptive large neighbourhood search, starting at `initial`.
+    At each iteration, a `destroy` operator takes the current candidate (and
+    the search state) and returns a partial solution, of any kind, that a
+    `repair` operator turns into a new candidate. The new candidate is then
+    accepted as in `simulatedannealing`, with the given `temperature` profile.
+
+    Each operator is drawn with a probability proportional to its weight.
+    After each use, its weight moves by a factor `reaction` towards a reward,
+    divided by its average time relative to the other operators of its kind:
+    `rewards[0]` for a new best candidate, `rewards[1]` for a candidate
+    better than the current one, `rewards[2]` for any other accepted one and
+    0 otherwise. Weights and per-operator statistics are available in the
+    `operators` attribute of the returned state.
+
+    If candidates are modified in place, a rejected candidate is reverted as
+    a whole: destroy and repair must then produce a single undoable move.
+    '''
+    heuristic = ALNS(destroy, repair, temperature, minimize, reaction, rewards)
+    return optimize(initial, heuristic.neighbour, heuristic, stop, trace)
 
 
 def temperature_calibration(s0, neigh, target_accept, n):
@@ -110,6 +222,7 @@ def temperature_calibration(s0, neigh, target_accept, n):
     l = []
     for _ in range(n):
         new = neigh(s, None)
+        new.commit()
         l.append(abs(new.cost - s.cost))
         s = new
     return -np.mean(np.array(l)) / np.log(target_accept)
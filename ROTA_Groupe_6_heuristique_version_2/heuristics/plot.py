@@ -0,0 +1,17 @@
+'''
+This module draws the traces of a `.state.State` with `matplotlib`. It is
+only imported by the plotting methods of `.state.State`, so that a search
+that never plots does not pay for loading `matplotlib`.
+'''
+
+import matplotlib.pyplot as plt
+from .trace import Trace
+
+
+def plot_trace(trace: Trace, points: int = 2000, **kwargs) -> None:
+    '''
+    Adds a step plot of `trace` (at most about `points` points, see
+    `.trace.Trace.downsample`) to the current `matplotlib.pyplot` graph.
+    '''
+    xs, ys = trace.downsample(points)
+    plt.step(xs, ys, **kwargs)
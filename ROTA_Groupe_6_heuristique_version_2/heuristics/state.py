@@ -3,13 +3,58 @@ Random walk algorithms need to maintain some technical information up-to-date
 for a correct behaviour. This module provides a `State` class containing such
 information. This state is returned at the end of the optimization process,
 so you can access all the history of the random walk, and plot interesting
-information.
+information (plotting requires `matplotlib`, loaded on first use).
 '''
 
-import matplotlib.pyplot as plt
 from datetime import datetime
-from typing import Optional
+from typing import Callable, Optional
 from .candidate import Candidate
+from .trace import Trace
+
+
+class OperatorStats:
+    '''
+    Statistics of one search operator, as collected by `.optimizers.alns`.
+    '''
+
+    def __init__(self, name: str) -> None:
+        '''@private'''
+        self.name: str = name
+        '''Name of the operator.'''
+        self.weight: float = 1.
+        '''Current selection weight of the operator.'''
+        self.calls: int = 0
+        '''Number of times the operator was used.'''
+        self.accepted: int = 0
+        '''Number of resulting candidates that were accepted.'''
+        self.improved: int = 0
+        '''Number of resulting candidates better than the current one.'''
+        self.new_best: int = 0
+        '''Number of resulting candidates that became the best one.'''
+        self.gain: float = 0.
+        '''Total improvement of the current cost brought by accepted candidates.'''
+        self.time: float = 0.
+        '''Total time spent in the operator, in seconds.'''
+
+    @property
+    def mean_time(self) -> float:
+        '''Average time of a call, in seconds.'''
+        return self.time / self.calls if self.calls else 0.
+
+    @property
+    def throughput(self) -> float:
+        '''Number of calls per second spent in the operator.'''
+        return self.calls / self.time if self.time else 0.
+
+    @property
+    def gain_rate(self) -> float:
+        '''Improvement of the current cost per second spent in the operator.'''
+        return self.gain / self.time if self.time else 0.
+
+    def __repr__(self) -> str:
+        return (f'{self.name}: weight {self.weight:.3f}, {self.calls} calls '
+                f'({self.accepted} accepted, {self.improved} improving, {self.new_best} best), '
+                f'{self.throughput:.1f} calls/s, gain {self.gain_rate:.1f}/s')
 
 
 class State:
@@ -17,7 +62,7 @@ class State:
     Represents the search state of random walks.
     '''
 
-    def __init__(self, minimize: bool) -> None:
+    def __init__(self, minimize: bool, trace: Callable[[], Trace] = Trace) -> None:
         '''@private'''
         self.start: datetime = datetime.now()
         '''Start time of the optimization process.'''
@@ -27,14 +72,22 @@ class State:
         self.current: Optional[Candidate] = None
         '''Current position (candidate solution) in the random walk.'''
         self.best: Optional[Candidate] = None
-        '''Best candidate solution since beginning of the random walk.'''
+        '''Best candidate solution since beginning of the random walk
+        (a snapshot, that later moves applied in place do not alter).'''
         self.iterations: int = -1
         '''Number of iterations performed.'''
         self.last_improved: int = -1
         '''Iteration at which the last improvement occured.'''
+        self.local_optimum: bool = False
+        '''Set by neighbour functions that scan their whole neighbourhood:
+        `True` if the last scan found no improving move.'''
+        self.operators: dict[str, OperatorStats] = {}
+        '''Statistics of each operator, by name (filled by `.optimizers.alns`).'''
         # self._candidates = []
-        self._accepted: list[tuple[int, int | float]] = []
-        self._convergence: list[tuple[int, int | float]] = []
+        self.accepted: Trace = trace()
+        '''Cost of accepted candidate solutions, by iteration.'''
+        self.convergence: Trace = trace()
+        '''Cost of the best candidate solution, at each improvement.'''
 
     def __enter__(self):
         '''@private'''
@@ -71,25 +124,27 @@ class State:
         self.iterations += 1
         # self._candidates.append(candidate)
         if accepted:
-            self._accepted.append((self.iterations, candidate.cost))
+            self.accepted.append(self.iterations, candidate.cost)
             self.current = candidate
         if self.is_better(candidate):
-            self._convergence.append((self.iterations, candidate.cost))
-            self.best = candidate
+            self.convergence.append(self.iterations, candidate.cost)
+            self.best = candidate.snapshot()
             self.last_improved = self.iterations
 
-    def plot_best(self, **kwargs) -> None:
+    def plot_best(self, points: int = 2000, **kwargs) -> None:
         '''
         Adds a plot to the current `matplolib.pyplot` graph showing the cost of
-        the best candidate solution so far.
+        the best candidate solution so far (at most about `points` points,
+        see `.trace.Trace.downsample`).
         '''
-        xs, ys = zip(*self._convergence)
-        plt.step(xs, ys, **kwargs)
+        from .plot import plot_trace
+        plot_trace(self.convergence, points, **kwargs)
 
-    def plot_convergence(self, **kwargs) -> None:
+    def plot_convergence(self, points: int = 2000, **kwargs) -> None:
         '''
         Adds a plot to the current `matplolib.pyplot` graph showing the cost of
-        accepted candidate solutions.
+        accepted candidate solutions (at most about `points` points,
+        see `.trace.Trace.downsample`).
         '''
-        xs, ys = zip(*self._accepted)
-        plt.step(xs, ys, **kwargs)
+        from .plot import plot_trace
+        plot_trace(self.accepted, points, **kwargs)
@@ -25,6 +25,7 @@ The currently available constructors are:
 - `MaxTime`
 - `MaxIteration`
 - `NoImprovement`
+- `LocalOptimum`
 - `Custom`
 
 .. note::
@@ -80,6 +81,18 @@ class NoImprovement(Stop):
     def __call__(self, state): return state.iterations_without_improvement >= self.n
 
 
+class LocalOptimum(Stop):
+
+    def __init__(self):
+        '''
+        Stopper that triggers once the neighbour function reports a local
+        optimum (see `.state.State.local_optimum`). Only meaningful with
+        neighbour functions that scan their whole neighbourhood.
+        '''
+
+    def __call__(self, state): return state.local_optimum
+
+
 class Custom(Stop):
 
     def __init__(self, stop : Callable[[State], bool]) -> None:
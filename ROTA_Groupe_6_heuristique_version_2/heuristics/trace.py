@@ -0,0 +1,134 @@
+'''
+This module provides a compact storage for the traces recorded by a random
+walk (the cost of accepted candidates, the cost of the best one), as pairs
+(iteration, value). Points are stored in NumPy arrays rather than Python
+tuples, which costs 16 bytes per point, and can be thinned on the fly:
+```python
+Trace()                        # every point
+Trace(every=100)               # one point in 100
+Trace(changes_only=True)       # only points where the value changes
+Trace(spill=1_000_000)         # points beyond the first million go to a temporary file
+```
+To use such options in a search, give the corresponding factory to the
+optimizer, *e.g.* `simulatedannealing(..., trace=partial(Trace, every=100))`.
+'''
+
+import numpy as np
+from tempfile import TemporaryFile
+from typing import Optional
+
+
+class Trace:
+    '''
+    Growable sequence of (iteration, value) points.
+    '''
+
+    dtype = np.dtype([('iteration', np.int64), ('value', np.float64)])
+    '''@private Layout of a point, in memory and in the spill file.'''
+
+    def __init__(self, every: int = 1, changes_only: bool = False,
+                 spill: Optional[int] = None, capacity: int = 1024) -> None:
+        '''
+        Create an empty trace keeping one point in `every` (among those that
+        pass the `changes_only` filter, if set). If `spill` is given, at most
+        that many points are kept in memory: the others are written to a
+        temporary file, read back through a memory map.
+        '''
+        self.every: int = every
+        '''Only one point in `every` is stored.'''
+        self.changes_only: bool = changes_only
+        '''If `True`, a point with the same value as the previous one is dropped.'''
+        self.spill: Optional[int] = spill
+        '''Maximum number of points kept in memory (`None`: no limit).'''
+        self.last: Optional[tuple[int, float]] = None
+        '''Last point appended, stored or not.'''
+        self._buffer = np.empty(min(capacity, spill) if spill else capacity, dtype=self.dtype)
+        self._size = 0
+        self._count = 0
+        self._dropped = False
+        self._file = None
+        self._spilled = 0
+
+    def __len__(self) -> int:
+        '''Number of stored points.'''
+        return self._spilled + self._size
+
+    def append(self, iteration: int, value: float) -> None:
+        '''
+        Record `value` at `iteration`, subject to decimation.
+        '''
+        if self.changes_only and self.last is not None and self.last[1] == value:
+            return
+        self.last = (iteration, value)
+        self._dropped = self._count > 0
+        self._count = (self._count + 1) % self.every
+        if self._dropped:
+            return
+        if self._size == len(self._buffer):
+            if self.spill is not None and self._size >= self.spill:
+                self._flush()
+            else:
+                capacity = 2 * self._size if self.spill is None else min(2 * self._size, self.spill)
+                self._buffer = np.resize(self._buffer, capacity)
+        self._buffer[self._size] = (iteration, value)
+        self._size += 1
+
+    def _flush(self) -> None:
+        if self._file is None:
+            self._file = TemporaryFile()
+        self._file.write(self._buffer[:self._size].tobytes())
+        self._file.flush()
+        self._spilled += self._size
+        self._size = 0
+
+    def _stored(self) -> np.ndarray:
+        # Once some points are spilled, the buffer is flushed too so that all
+        # stored points can be read through a single memory map
+        if not self._spilled:
+            return self._buffer[:self._size]
+        if self._size:
+            self._flush()
+        return np.memmap(self._file, dtype=self.dtype, mode='r', shape=(self._spilled,))
+
+    def _tail(self) -> np.ndarray:
+        # The last point appended, if decimation dropped it
+        return np.array([self.last] if self._dropped else [], dtype=self.dtype)
+
+    def points(self) -> np.ndarray:
+        '''
+        All stored points, followed by the last point appended if it was
+        dropped, as a structured array with fields `iteration` and `value`.
+        '''
+        return np.concatenate([self._stored(), self._tail()])
+
+    def downsample(self, n: int = 2000) -> tuple[np.ndarray, np.ndarray]:
+        '''
+        At most about `n` points of the trace, as two arrays (iterations,
+        values). The points are split into `n / 2` consecutive buckets, of
+        which only the lowest and the highest values are kept (in order), so
+        that the envelope of the trace is preserved. The first and last
+        points are always kept. Spilled points are scanned through the
+        memory map, without loading the whole trace.
+        '''
+        stored = self._stored()
+        if len(stored) <= n:
+            points = np.concatenate([stored, self._tail()])
+            return points['iteration'], points['value']
+        values = stored['value']
+        size = -(-len(stored) // max(n // 2, 1))
+        buckets = len(stored) // size
+        blocks = values[:buckets * size].reshape(buckets, size)
+        offsets = np.arange(buckets) * size
+        kept = np.unique(np.concatenate([offsets + blocks.argmin(axis=1), offsets + blocks.argmax(axis=1),
+                                         np.arange(buckets * size, len(stored)), [0, len(stored) - 1]]))
+        points = np.concatenate([stored[kept], self._tail()])
+        return points['iteration'], points['value']
+
+    def close(self) -> None:
+        '''
+        Delete the spill file, if any. Spilled points are lost.
+        '''
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._spilled = 0
@@ -1,6 +1,14 @@
 import json
 import random
-import copy
+from collections import Counter
+
+from capacite import CapacityLedger
+from ensembles import aleatoires
+from espacement import DepartureIndex, SpacingIndex
+from evaluation import evaluation_vectorielle
+from flotte import FleetAvailability, departs_libres
+from gains import meilleure_insertion
+from mouvements import Move, Transfert, insertion, remplacement, retrait
 
 # Charger les données depuis un fichier JSON
 def charger_donnees(fichier):
@@ -22,67 +30,68 @@ def creer_vols(donnees):
     return vols
 
 # Planification initiale gloutonne
-def planifier_vols(vols, donnees):
+def planifier_vols(ctx):
     solution = []
-    slots_disponibles = donnees["slots"][:]
-    m = donnees["n_aircraft"]
-    Tmax = donnees["time_horizon_len"]
-    planning = [[0] * Tmax for _ in range(m)]
+    m = ctx.n_avions
+    Tmax = ctx.Tmax
+    planning = FleetAvailability(m, Tmax)  # disponibilité des avions
     profit_total = 0
     vols_planifiés = set()  # Pour éviter les doublons
+    capacites = CapacityLedger(ctx)  # créneaux du hub et vols restants par destination
+    index = SpacingIndex(ctx)  # départs par destination
+    par_avion = DepartureIndex(m)  # départs par avion, repérés par leur rang dans la solution
 
-    vols_tries = sorted(vols, key=lambda v: v["profit"], reverse=True)
+    vols_tries = ctx.vols_par_profit
 
-    for vol_info in vols_tries:
-        vol_id = vol_info["vol"]
+    for vol_id in vols_tries:
         if vol_id in vols_planifiés:
             continue
-        t, duree, profits = vol_info["time"], vol_info["flight_time"], vol_info["profit"]
-        if t + duree <= Tmax and slots_disponibles[t] > 0:
-            for k in range(m):
-            # Vérification de l'espacement avant de planifier
-                if all(planning[k][t + dt] == 0 for dt in range(duree)):
-                    violation = violation_espacement((k, vol_id, t), donnees, solution, vols)
-                    if violation == 0:  # Si aucune violation d'espacement
-                    # Vérification de l'espacement avec les autres vols du même avion
-                        for autre_vol in solution:
-                            if autre_vol[0] == k:  # Vérifie les vols du même avion
-                                t_autre, duree_autre = autre_vol[2], donnees["destinations"][obtenir_destination(autre_vol[1], vols)]["flight_time"]
-                                if abs(t - t_autre) < donnees["min_spacing"]:  # Violations d'espacement entre vols du même avion
-                                # Déplacer le vol actuel ou ajuster l'horaire
-                                    t = t_autre + donnees["min_spacing"]
-                                    break
-                        if violation == 0:  # Si l'espacement est respecté
-                        # Affecter le vol
-                            if t + duree > Tmax:
-                                continue
-                            else:
-                                for dt in range(duree):
-                                    planning[k][t + dt] = 1
-                                slots_disponibles[t] -= 1
-                                profit_total += profits
-                                solution.append((k, vol_id, t))
-                                vols_planifiés.add(vol_id)
-                                break
+        t, duree, profits = ctx.instant[vol_id], ctx.duree[vol_id], ctx.profit[vol_id]
+        if t + duree <= Tmax and capacites.disponible(vol_id, t):
+            # Parcours des seuls avions libres sur [t, t + duree)
+            k = planning.premier_avion(t, duree)
+            while k is not None:
+                # Vérification de l'espacement avant de planifier
+                # (elle ne dépend pas de l'avion : inutile d'essayer les suivants)
+                if index.violation(vol_id, t) != 0:
+                    break
+                # Vérification de l'espacement avec les autres vols du même avion :
+                # le premier (dans l'ordre de la solution) trop proche décale le vol
+                proches = list(par_avion.fenetre(k, t - ctx.min_spacing, t + ctx.min_spacing))
+                if proches:
+                    t_autre, _ = min(proches, key=lambda p: p[1])
+                    # Déplacer le vol actuel ou ajuster l'horaire
+                    t = t_autre + ctx.min_spacing
+                # Affecter le vol
+                if t + duree <= Tmax:
+                    planning.occuper(k, t, duree)
+                    capacites.reserver(vol_id, t)
+                    profit_total += profits
+                    par_avion.ajouter(k, t, len(solution))
+                    solution.append((k, vol_id, t))
+                    index.ajouter_vol((k, vol_id, t))
+                    vols_planifiés.add(vol_id)
+                    break
+                k = planning.premier_avion(t, duree, k + 1)
 
     # Vérification de l'utilisation minimale
     for k in range(m):
-        temps_utilisé = sum(planning[k])
-        while temps_utilisé < donnees["min_utilisation"] * Tmax:  # tant que l'avion n'est pas assez utilisé 
-            for vol_info in vols_tries:
-                vol_id = vol_info["vol"]
+        temps_utilisé = planning.occupation(k)
+        while temps_utilisé < ctx.min_utilisation * Tmax:  # tant que l'avion n'est pas assez utilisé 
+            for vol_id in vols_tries:
                 if vol_id in vols_planifiés:
                     continue
-                t, duree, profits = vol_info["time"], vol_info["flight_time"], vol_info["profit"]
-                if t + duree <= Tmax and slots_disponibles[t] > 0:
-                    if all(planning[k][t + dt] == 0 for dt in range(duree)):
-                        violation = violation_espacement((k, vol_id, t), donnees, solution, vols)
+                t, duree, profits = ctx.instant[vol_id], ctx.duree[vol_id], ctx.profit[vol_id]
+                if t + duree <= Tmax and capacites.disponible(vol_id, t):
+                    if planning.libre(k, t, duree):
+                        violation = index.violation(vol_id, t)
                         if violation == 0:  # Si aucune violation d'espacement
-                            for dt in range(duree):
-                                planning[k][t + dt] = 1
-                            slots_disponibles[t] -= 1
+                            planning.occuper(k, t, duree)
+                            capacites.reserver(vol_id, t)
                             profit_total += profits
+                            par_avion.ajouter(k, t, len(solution))
                             solution.append((k, vol_id, t))
+                            index.ajouter_vol((k, vol_id, t))
                             temps_utilisé += duree
                             break
             else:
@@ -93,183 +102,371 @@ def planifier_vols(vols, donnees):
 
 
 # Utilitaire pour trouver la destination d’un vol
-def obtenir_destination(id_vol, vols):
-    for vol in vols:
-        if vol["vol"] == id_vol:
-            return vol["destination"]
+def obtenir_destination(id_vol, ctx):
+    if 1 <= id_vol <= ctx.n_vols:
+        return ctx.destination[id_vol]
     return None
 
 # Vérifie les violations d’espacement entre les vols d’une même destination
-# Vérifie les violations d’espacement entre les vols d’une même destination
-def violation_espacement(vol, donnees, solution, vols):
+def violation_espacement(vol, ctx, solution):
     id_vol, t = vol[1], vol[2]
-    destination = obtenir_destination(id_vol, vols)  # obtenir la destination du vol
-    min_spacing = donnees["min_spacing"]  # espacement minimum
+    destination = ctx.destination[id_vol]  # obtenir la destination du vol
+    min_spacing = ctx.min_spacing  # espacement minimum
+    arrivee = t + ctx.duree[id_vol]
     violations = 0  # compteur des violations
 
     # Parcours de tous les autres vols dans la solution pour vérifier les violations d'espacement
     for autre_vol in solution:
         if autre_vol[1] == id_vol:  
             continue
-        autre_destination = obtenir_destination(autre_vol[1], vols)  # obtenir la destination du vol autre
-        if autre_destination == destination:  # Vérifie si c'est le même avion (ou même destination)
+        if ctx.destination[autre_vol[1]] == destination:  # Vérifie si c'est la même destination
             # Calcul de l'écart entre les horaires d'arrivée du vol 1 et de départ du vol 2
-            ecart = abs(t + donnees["destinations"][destination]["flight_time"] - autre_vol[2])
-            print(f"Comparaison de vols {vol[1]} (t={t}) et {autre_vol[1]} (t={autre_vol[2]}) avec espacement min {min_spacing}")
-            print(f"Écart calculé : {ecart}")
+            ecart = abs(arrivee - autre_vol[2])
             if ecart < min_spacing:  # Si l'écart est inférieur à l'espacement minimum
                 violations += min_spacing - ecart  # Ajoute la violation d'espacement
-                print(f"Violation détectée ! (pénalité : {min_spacing - ecart})")
 
     return violations
 
 
 # Vérifie si un avion est sous-utilisé
-def violation_utilisation(avion, donnees, solution, vols):
+def violation_utilisation(avion, ctx, solution):
     temps_utilisation = 0
-    min_utilisation = donnees["min_utilisation"]
-    Tmax = donnees["time_horizon_len"]
+    min_utilisation = ctx.min_utilisation
+    Tmax = ctx.Tmax
 
     for vol in solution:
         if vol[0] == avion:
-            destination = obtenir_destination(vol[1], vols)
-            temps_utilisation += donnees["destinations"][destination]["flight_time"]
+            temps_utilisation += ctx.duree[vol[1]]
 
     if temps_utilisation < min_utilisation * Tmax:
         return True, round(min_utilisation * Tmax - temps_utilisation, 2)
     return False, 0
 
-# Fonction d’évaluation de la solution (à maximiser)
-def fonction_evaluation(solution, donnees, lambda_espacement, lambda_utilisation, vols, profit_total=None):
-    if profit_total is None:
-        profit_total = sum(vol["profit"] for _, id_vol, _ in solution for vol in vols if vol["vol"] == id_vol)
-
-    penalite_espacement = sum(
-        violation_espacement(vol, donnees, solution, vols) for vol in solution 
-    )
-
-    penalite_utilisation = 0
-    for k in range(donnees["n_aircraft"]):
-        violation, penalite = violation_utilisation(k, donnees, solution, vols)
-        if violation:
-            penalite_utilisation += penalite
+# Fonction d’évaluation de la solution (à maximiser) : une seule
+# implémentation, vectorielle (voir evaluation.py)
+def fonction_evaluation(solution, ctx, lambda_espacement, lambda_utilisation, profit_total=None):
+    return evaluation_vectorielle(solution, ctx, lambda_espacement, lambda_utilisation, profit_total)
 
-    score = profit_total - lambda_espacement * penalite_espacement - lambda_utilisation * penalite_utilisation
-    return score, profit_total, penalite_espacement, penalite_utilisation
+# Les voisinages sont des générateurs de mouvements (voir mouvements.py) sur
+# un Schedule (voir ordonnancement.py), dans l'ordre où l'ancienne version
+# les essayait : le premier mouvement produit est le voisin historique. Rien
+# n'est modifié tant qu'on n'appelle pas apply() ; le générateur ne doit plus
+# être poursuivi une fois un mouvement appliqué.
 
 # Voisinage 1 : suppression et réinsertion d’un vol
-def voisinage_1(solution, planning, profit_total, donnees):
-    nouvelle_solution = copy.deepcopy(solution)
-    nouveau_planning = copy.deepcopy(planning)
-    nouveau_profit_total = profit_total
-    slots_disponibles = donnees["slots"][:]
-    Tmax = donnees["time_horizon_len"]
-    vols = creer_vols(donnees)
-
-    if not nouvelle_solution:
-        return solution, profit_total, planning
-
-    vol_a_retirer = random.choice(nouvelle_solution)
-    nouvelle_solution.remove(vol_a_retirer)
+def voisinage_1(programme, ctx):
+    if not programme.solution:
+        return
+
+    vol_a_retirer = random.choice(programme.solution)
     avion, id_vol, t = vol_a_retirer
-    destination = obtenir_destination(id_vol, vols)
-    duree = donnees["destinations"][destination]["flight_time"]
-    profit = donnees["destinations"][destination]["profit"][t]
-
-    for dt in range(duree):
-        nouveau_planning[avion][t + dt] = 0
-    slots_disponibles[t] += 1
-    nouveau_profit_total -= profit
-
-    # Essayer de réinsérer un vol
-    for t_nouveau in range(Tmax - duree + 1):
-        if slots_disponibles[t_nouveau] > 0:
-            for k in range(len(nouveau_planning)):
-                if all(nouveau_planning[k][t_nouveau + dt] == 0 for dt in range(duree)):
-                    # Vérification de l'espacement avant d'ajouter le vol
-                    violation = violation_espacement((k, id_vol, t_nouveau), donnees, nouvelle_solution, vols)
-                    if violation == 0:  # Si pas de violation, on peut ajouter le vol
-                        for dt in range(duree):
-                            nouveau_planning[k][t_nouveau + dt] = 1
-                        slots_disponibles[t_nouveau] -= 1
-                        nouveau_profit_total += donnees["destinations"][destination]["profit"][t_nouveau]
-                        nouvelle_solution.append((k, id_vol, t_nouveau))
-                        return nouvelle_solution, nouveau_profit_total, nouveau_planning
-
-    return nouvelle_solution, nouveau_profit_total, nouveau_planning
+    duree = ctx.duree[id_vol]
+    planning, index, capacites = programme.planning, programme.index, programme.capacites
+
+    # Réinsertions possibles, aux seuls départs où un avion est libre et où il
+    # reste un créneau au hub une fois le vol retiré
+    possibles = planning.departs_possibles_apres_retrait(duree, avion, t, duree)
+    t_nouveau = capacites.prochain_creneau(0, vol_a_retirer)
+    while t_nouveau is not None and possibles >> t_nouveau:
+        suivants = possibles >> t_nouveau
+        decalage = (suivants & -suivants).bit_length() - 1
+        if decalage:  # pas d'avion libre à t_nouveau : prochain départ possible
+            t_nouveau = capacites.prochain_creneau(t_nouveau + decalage, vol_a_retirer)
+            continue
+        # Vérification de l'espacement avant d'ajouter le vol
+        if not index.en_conflit(id_vol, t_nouveau, vol_a_retirer):  # Si pas de violation, on peut ajouter le vol
+            k = planning.premier_avion_apres_retrait(t_nouveau, duree, avion, t, duree)
+            yield remplacement(programme, vol_a_retirer, (k, id_vol, t_nouveau))
+        t_nouveau = capacites.prochain_creneau(t_nouveau + 1, vol_a_retirer)
+
+    # Aucune réinsertion : le vol est seulement retiré
+    yield retrait(programme, vol_a_retirer)
 
 # Voisinage 2 : remplacement d’un vol par un autre non encore planifié
-def voisinage_2(solution, planning, profit_total, donnees, vols):
-    nouvelle_solution = copy.deepcopy(solution)
-    nouveau_planning = copy.deepcopy(planning)
-    nouveau_profit_total = profit_total
-
-    if not nouvelle_solution:
-        return solution, profit_total, planning
-
-    vol_retiré = random.choice(nouvelle_solution)
-    nouvelle_solution.remove(vol_retiré)
-    avion, id_vol, t_depart = vol_retiré
-    destination = obtenir_destination(id_vol, vols)
-    duree = donnees["destinations"][destination]["flight_time"]
-    profit_retiré = donnees["destinations"][destination]["profit"][t_depart]
-
-    # Libération du créneau horaire
-    for t in range(t_depart, t_depart + duree):
-        if t < donnees["time_horizon_len"]:
-            nouveau_planning[avion][t] = 0
-
-    nouveau_profit_total -= profit_retiré
-
-    # Interdire de replanifier un vol déjà dans la solution
-    vols_ids_solution = {v[1] for v in nouvelle_solution}
-
-    # Essayer de trouver un nouveau vol à insérer à la place
-    vols_non_planifies = [v for v in vols if v["vol"] not in vols_ids_solution]
-    random.shuffle(vols_non_planifies)
-
-    for vol_candidat in vols_non_planifies:
-        t_cand = vol_candidat["time"]
-        duree_cand = vol_candidat["flight_time"]
-        if t_cand + duree_cand > donnees["time_horizon_len"]:
+def voisinage_2(programme, ctx):
+    if not programme.solution:
+        return
+
+    vol_retiré = random.choice(programme.solution)
+    avion, id_retiré, t_retiré = vol_retiré
+    duree_retiré = ctx.duree[id_retiré]
+    planning, index, capacites = programme.planning, programme.index, programme.capacites
+
+    # Vols de remplacement, dans un ordre aléatoire, parmi les vols non
+    # planifiés (un vol déjà dans la solution est exclu)
+    for id_candidat in programme.non_planifies.aleatoires():
+        t_cand = ctx.instant[id_candidat]
+        duree_cand = ctx.duree[id_candidat]
+        if not capacites.disponible(id_candidat, t_cand, vol_retiré):
             continue
 
-        for k in range(donnees["n_aircraft"]):
-            if all(nouveau_planning[k][t_cand + dt] == 0 for dt in range(duree_cand)):
-                violation = violation_espacement((k, vol_candidat["vol"], t_cand), donnees, nouvelle_solution, vols)
-                if violation == 0:
-                    # Planification du nouveau vol
-                    for dt in range(duree_cand):
-                        nouveau_planning[k][t_cand + dt] = 1
-                    nouveau_profit_total += vol_candidat["profit"]
-                    nouvelle_solution.append((k, vol_candidat["vol"], t_cand))
-                    return nouvelle_solution, nouveau_profit_total, nouveau_planning
-
-    # Aucun vol de remplacement valide trouvé : on garde la solution partielle
-    return nouvelle_solution, nouveau_profit_total, nouveau_planning
-
-
-def voisinage_3(solution, planning, profit_total, donnees, vols):
-    nouvelle_solution = copy.deepcopy(solution)
-    nouveau_planning = copy.deepcopy(planning)
-    nouveau_profit_total = profit_total
-    Tmax = donnees["time_horizon_len"]
-    vols_ids_solution = {v[1] for v in nouvelle_solution}
-    random.shuffle(vols)
-
-    for vol in vols:
-        if vol["vol"] in vols_ids_solution:
+        k = planning.premier_avion_apres_retrait(t_cand, duree_cand, avion, t_retiré, duree_retiré)
+        if k is not None and not index.en_conflit(id_candidat, t_cand, vol_retiré):
+            yield remplacement(programme, vol_retiré, (k, id_candidat, t_cand))
+
+    # Aucun vol de remplacement valide : on garde la solution partielle
+    yield retrait(programme, vol_retiré)
+
+
+# Voisinage 3 : ajout d’un vol non encore planifié
+# En mode meilleure amélioration (`meilleur`), tout le voisinage est évalué
+# d'un bloc (voir gains.py) et seule la meilleure insertion est produite, si
+# elle améliore le score : rien n'est produit à un optimum local.
+# Sinon, on ne tire que des vols des destinations qui ont encore des vols
+# autorisés (rien n'est produit si toutes sont épuisées), et au plus `essais`
+# tirages : une solution saturée ne fait pas parcourir tous les vols non planifiés.
+def voisinage_3(programme, ctx, meilleur=False, essais=100):
+    if meilleur:
+        mouvement = meilleure_insertion(programme, ctx)
+        if mouvement is not None:
+            yield mouvement
+        return
+
+    planning, index, capacites = programme.planning, programme.index, programme.capacites
+    ouvertes = [destination for destination, restants in enumerate(capacites.vols_restants) if restants > 0]
+    if not ouvertes:
+        return
+
+    for _ in range(essais):
+        id_vol = random.choice(ctx.vols_par_destination[random.choice(ouvertes)])
+        t, duree = ctx.instant[id_vol], ctx.duree[id_vol]
+        if id_vol not in programme.non_planifies or not capacites.creneau_libre(t):
+            continue
+        k = planning.premier_avion(t, duree)
+        if k is not None and not index.en_conflit(id_vol, t):
+            yield insertion(programme, (k, id_vol, t))
+
+
+# Voisinage 4 : même vol, même départ, sur un autre avion libre, en
+# commençant par les avions les moins utilisés (équilibrage du temps de vol)
+def voisinage_4(programme, ctx):
+    if not programme.solution:
+        return
+
+    vol = random.choice(programme.solution)
+    avion, id_vol, t = vol
+    utilisation = programme.evaluateur.utilisation
+    for k in sorted(programme.planning.avions_libres(t, ctx.duree[id_vol]), key=lambda k: utilisation[k]):
+        yield Transfert(programme, (vol,), ((k, id_vol, t),))
+
+
+# Voisinage 5 : échange de deux vols entre deux avions. Les partenaires sont
+# tirés paresseusement, dans un ordre aléatoire ; chaque vol doit tenir sur
+# l'avion de l'autre une fois celui-ci retiré (test sur les masques du planning).
+def voisinage_5(programme, ctx):
+    if not programme.solution:
+        return
+
+    vol = random.choice(programme.solution)
+    avion, id_vol, t = vol
+    masques, fenetre = programme.planning.masques, programme.planning.fenetre(t, ctx.duree[id_vol])
+    sans_vol = masques[avion] & ~fenetre
+    for autre in aleatoires(programme.solution):
+        autre_avion, autre_id, autre_t = autre
+        if autre_avion == avion:
+            continue
+        autre_fenetre = programme.planning.fenetre(autre_t, ctx.duree[autre_id])
+        if sans_vol & autre_fenetre or masques[autre_avion] & ~autre_fenetre & fenetre:
+            continue
+        yield Transfert(programme, (vol, autre), ((autre_avion, id_vol, t), (avion, autre_id, autre_t)))
+
+
+# Voisinage 6 : échange des horaires de deux vols de destinations
+# différentes. Chaque avion garde sa destination et prend l'horaire de
+# l'autre vol : les créneaux du hub et les nombres de vols sont inchangés.
+# Les partenaires sont tirés paresseusement, dans un ordre aléatoire ; les
+# départs où l'avion du vol peut reprendre sa destination sont calculés une
+# fois, sur les masques du planning.
+def voisinage_6(programme, ctx):
+    if not programme.solution:
+        return
+
+    vol = random.choice(programme.solution)
+    avion, id_vol, t = vol
+    destination, duree = ctx.destination[id_vol], ctx.duree[id_vol]
+    departs = departs_libres(programme.planning.masques[avion] & ~programme.planning.fenetre(t, duree),
+                             duree, ctx.Tmax)
+    for autre in aleatoires(programme.solution):
+        autre_avion, autre_id, autre_t = autre
+        autre_destination = ctx.destination[autre_id]
+        if autre_destination == destination or autre_t == t or not departs >> autre_t & 1:
+            continue
+        nouveau = ctx.id_vol(destination, autre_t)
+        autre_nouveau = ctx.id_vol(autre_destination, t)
+        if (not programme.realisable(autre_nouveau)
+                or programme.contient(nouveau) or programme.contient(autre_nouveau)):
+            continue
+        mouvement = Move(programme, (vol, autre), ((avion, nouveau, autre_t), (autre_avion, autre_nouveau, t)))
+        if mouvement.flotte_libre() and mouvement.sans_conflit():
+            yield mouvement
+
+
+# Voisinage 7 : échange des fins de planning de deux avions (2-échange de
+# blocs) : à partir d'un instant de coupure c, les vols partant à c ou après
+# passent d'un avion à l'autre. On ne coupe pas au milieu d'un vol.
+def voisinage_7(programme, ctx):
+    if ctx.n_avions < 2 or not programme.solution:
+        return
+
+    a, b = random.sample(range(ctx.n_avions), 2)
+    vols_a, vols_b = programme.vols_avion(a), programme.vols_avion(b)
+    vols = vols_a + vols_b
+    if not vols:
+        return
+    # Coupures utiles : un départ, après le premier départ des deux avions
+    # (sinon on échange simplement les deux plannings)
+    coupures = list({t for _, _, t in vols} - {min(t for _, _, t in vols)})
+    random.shuffle(coupures)
+    for c in coupures:
+        if any(t < c < t + ctx.duree[id_vol] for _, id_vol, t in vols):
+            continue
+        fin_a = tuple(vol for vol in vols_a if vol[2] >= c)
+        fin_b = tuple(vol for vol in vols_b if vol[2] >= c)
+        yield Transfert(programme, fin_a + fin_b,
+                        tuple((b, id_vol, t) for _, id_vol, t in fin_a) + tuple((a, id_vol, t) for _, id_vol, t in fin_b))
+
+
+# Voisinage 8 : chaîne d'éjections, pour les instances où les avions sont
+# presque pleins. Un vol non planifié de fort profit est placé sur un avion ;
+# s'il y chevauche un vol, ce vol est éjecté et replacé, au même départ, sur
+# un autre avion, où il peut à son tour en éjecter un, et ainsi de suite
+# jusqu'à `profondeur` éjections. La chaîne se termine quand le dernier vol
+# trouve un avion libre, ou en le retirant de la solution. Seul le premier
+# vol change l'espacement, les créneaux et les nombres de vols ; les vols
+# éjectés ne font que changer d'avion.
+# Les chaînes sont explorées en profondeur, sur au plus `largeur` avions
+# par niveau, et produites de la meilleure à la moins bonne.
+class EjectionChain:
+    def __init__(self, profondeur=3, largeur=3, essais=10):
+        self.profondeur = profondeur
+        self.largeur = largeur
+        self.essais = essais  # vols de départ tirés avant d'abandonner
+        # recherches, noeuds, chaînes, et longueurs des chaînes produites
+        self.statistiques = Counter()
+        self.longueurs = Counter()
+
+    def __call__(self, programme, ctx):
+        index, capacites = programme.index, programme.capacites
+        self.duree_max = max(destination["flight_time"] for destination in ctx.donnees["destinations"])
+
+        for _ in range(self.essais):
+            id_vol = programme.non_planifies.tirage_pondere()
+            if id_vol is None:
+                return
+            t = ctx.instant[id_vol]
+            if not capacites.disponible(id_vol, t) or index.en_conflit(id_vol, t):
+                continue
+            self.statistiques["recherches"] += 1
+            self.chaines = []
+            self._explorer(programme, ctx, id_vol, t, None, (), (), self.profondeur)
+            if self.chaines:
+                self.chaines.sort(key=lambda chaine: chaine[0], reverse=True)
+                for _, mouvement in self.chaines:
+                    self.longueurs[len(mouvement.retraits)] += 1
+                    yield mouvement
+                return
+
+    def _noter(self, mouvement):
+        self.statistiques["chaines"] += 1
+        self.chaines.append((mouvement.delta(), mouvement))
+
+    def _explorer(self, programme, ctx, id_vol, t, origine, retraits, insertions, profondeur):
+        # Place le vol (id_vol, t), qui quitte l'avion `origine`, sur un autre avion
+        self.statistiques["noeuds"] += 1
+        duree = ctx.duree[id_vol]
+        libres, branches = [], []
+        for k in range(ctx.n_avions):
+            if k == origine:
+                continue
+            if any(v[0] == k and v[2] < t + duree and t < v[2] + ctx.duree[v[1]] for v in insertions):
+                continue
+            # Vols de l'avion partis moins d'une durée maximale avant t (index par avion du programme)
+            occupants = [(k, autre_id, autre_t)
+                         for autre_t, autre_id in programme.par_avion.fenetre(k, t - self.duree_max, t + duree)
+                         if t < autre_t + ctx.duree[autre_id] and (k, autre_id, autre_t) not in retraits]
+            if not occupants:
+                libres.append(k)
+            elif len(occupants) == 1 and profondeur > 0:
+                branches.append((k, occupants[0]))
+
+        # Fin de chaîne sur le meilleur avion libre
+        if libres:
+            mouvements = [Move(programme, retraits, insertions + ((k, id_vol, t),)) for k in libres]
+            self._noter(max(mouvements, key=lambda mouvement: mouvement.delta()))
+
+        # Éjection de l'unique vol qui chevauche, sur quelques avions au hasard
+        for k, ejecte in random.sample(branches, min(self.largeur, len(branches))):
+            suite = Move(programme, retraits + (ejecte,), insertions + ((k, id_vol, t),))
+            self._noter(suite)  # la chaîne peut s'arrêter en retirant le vol éjecté
+            self._explorer(programme, ctx, ejecte[1], ejecte[2], k, suite.retraits, suite.insertions, profondeur - 1)
+
+    def rapport(self):
+        statistiques = self.statistiques
+        longueurs = ", ".join(f"{n}: {nombre}" for n, nombre in sorted(self.longueurs.items()))
+        return (f"Chaînes d'éjections : {statistiques['recherches']} recherches, {statistiques['noeuds']} noeuds, "
+                f"{statistiques['chaines']} chaînes évaluées ; "
+                f"éjections par chaîne produite : {longueurs}")
+
+
+# Voisinage 8 : la classe elle-même. Chaque FlightPlanningModel en crée sa
+# propre instance, dont les statistiques ne concernent que sa recherche.
+voisinage_8 = EjectionChain
+
+
+# Décalages réalisables d'un vol planifié, sur le même avion, d'au plus
+# `amplitude` pas de temps (min_spacing par défaut), listés en une passe :
+# départs libres de l'avion une fois le vol retiré, créneaux du hub, vol de
+# la même destination au nouvel horaire pas encore planifié. Le nombre de
+# vols vers la destination est inchangé ; l'espacement et le profit au
+# nouvel horaire sont pris en compte par le delta du mouvement.
+def decalages(programme, ctx, vol, amplitude=None):
+    avion, id_vol, t = vol
+    amplitude = ctx.min_spacing if amplitude is None else amplitude
+    destination, duree = ctx.destination[id_vol], ctx.duree[id_vol]
+    planning, capacites = programme.planning, programme.capacites
+    libres = departs_libres(planning.masques[avion] & ~planning.fenetre(t, duree), duree, ctx.Tmax)
+    for t_nouveau in range(max(t - amplitude, 0), min(t + amplitude, ctx.Tmax - duree) + 1):
+        if t_nouveau == t or not (libres >> t_nouveau) & 1 or not capacites.creneau_libre(t_nouveau):
             continue
-        t, duree = vol["time"], vol["flight_time"]
-        if t + duree > Tmax:
+        nouveau = ctx.id_vol(destination, t_nouveau)
+        if not programme.contient(nouveau):
+            yield remplacement(programme, vol, (avion, nouveau, t_nouveau))
+
+
+# Voisinage 9 : décalage d'un vol plus tôt ou plus tard. Tous les décalages
+# du vol tiré sont produits, du meilleur au moins bon avec `meilleur`, dans
+# un ordre aléatoire sinon.
+def voisinage_9(programme, ctx, meilleur=False, amplitude=None):
+    if not programme.solution:
+        return
+
+    vol = random.choice(programme.solution)
+    mouvements = list(decalages(programme, ctx, vol, amplitude))
+    if meilleur:
+        deltas = {mouvement: mouvement.delta() for mouvement in mouvements}
+        mouvements.sort(key=deltas.get, reverse=True)
+        if not mouvements or deltas[mouvements[0]] <= 0:
+            programme.ne_pas_regarder.marquer(vol)
+    else:
+        random.shuffle(mouvements)
+    yield from mouvements
+
+
+# Meilleur décalage sur tous les vols planifiés, ou None si aucun décalage
+# n'améliore le score. Les vols marqués "ne pas regarder" sont sautés ; un
+# vol dont aucun décalage n'améliore le score est marqué.
+def meilleur_decalage(programme, ctx, amplitude=None):
+    ne_pas_regarder = programme.ne_pas_regarder
+    meilleur, meilleur_delta = None, 0
+    for vol in programme.solution:
+        if not ne_pas_regarder.regarder(vol):
             continue
-        for k in range(donnees["n_aircraft"]):
-            if all(nouveau_planning[k][t + dt] == 0 for dt in range(duree)):
-                violation = violation_espacement((k, vol["vol"], t), donnees, nouvelle_solution, vols)
-                if violation == 0:
-                    for dt in range(duree):
-                        nouveau_planning[k][t + dt] = 1
-                    nouveau_profit_total += vol["profit"]
-                    nouvelle_solution.append((k, vol["vol"], t))
-                    return nouvelle_solution, nouveau_profit_total, nouveau_planning
-    return nouvelle_solution, nouveau_profit_total, nouveau_planning
+        ameliore = False
+        for mouvement in decalages(programme, ctx, vol, amplitude):
+            delta = mouvement.delta()
+            ameliore = ameliore or delta > 0
+            if delta > meilleur_delta:
+                meilleur, meilleur_delta = mouvement, delta
+        if not ameliore:
+            ne_pas_regarder.marquer(vol)
+    return meilleur
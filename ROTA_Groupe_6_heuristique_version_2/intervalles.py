@@ -0,0 +1,88 @@
+from bisect import bisect_right
+
+from capacite import CapacityLedger
+from espacement import SpacingIndex
+from flotte import FleetAvailability
+
+
+# Ordonnancement d'intervalles pondérés pour un avion : parmi les options
+# (poids, début, fin, vol), choisir des intervalles [début, fin) disjoints de
+# poids total maximal. Programmation dynamique exacte en O(n log n) :
+# options triées par fin, meilleur[j] = max(meilleur[j - 1], poids_j + meilleur[p(j)])
+# où p(j) est le nombre d'options finissant au plus tard au début de j.
+def intervalles_ponderes(options):
+    options = sorted(options, key=lambda option: option[2])
+    fins = [option[2] for option in options]
+    meilleur = [0] * (len(options) + 1)
+    for j, (poids, debut, _, _) in enumerate(options, start=1):
+        meilleur[j] = max(meilleur[j - 1], poids + meilleur[bisect_right(fins, debut, 0, j - 1)])
+    # Reconstruction des options retenues
+    choisis = []
+    j = len(options)
+    while j > 0:
+        poids, debut, _, vol = options[j - 1]
+        p = bisect_right(fins, debut, 0, j - 1)
+        if poids + meilleur[p] >= meilleur[j - 1]:
+            choisis.append(vol)
+            j = p
+        else:
+            j -= 1
+    return choisis[::-1]
+
+
+# Construction avion par avion : chaque avion reçoit la sélection optimale
+# d'intervalles parmi les options (destination, t) encore disponibles,
+# pondérées par leur profit plus λu fois les heures de vol qui comblent le
+# déficit restant de l'avion. Les contraintes qui lient plusieurs vols
+# (créneaux, nombre de vols par destination, espacement) sont vérifiées à
+# l'insertion ; si un vol choisi est refusé, on relance la programmation
+# dynamique sur le même avion avec l'état mis à jour.
+# `ponderation` (facultative) multiplie le poids de chaque vol, par exemple
+# par sa valeur dans une relaxation linéaire ; un vol de coefficient nul
+# n'est pas proposé.
+def planifier_intervalles(ctx, lambda_utilisation, ponderation=None):
+    planning = FleetAvailability(ctx.n_avions, ctx.Tmax)
+    capacites = CapacityLedger(ctx)
+    index = SpacingIndex(ctx)
+    utilisation_min = ctx.min_utilisation * ctx.Tmax
+    planifies = set()
+    solution = []
+    profit_total = 0
+
+    for k in range(ctx.n_avions):
+        while True:
+            deficit = max(0, utilisation_min - planning.occupation(k))
+            options = []
+            for destination, ids in enumerate(ctx.vols_par_destination):
+                if capacites.vols_restants[destination] <= 0:
+                    continue
+                for id_vol in ids:
+                    t, duree = ctx.instant[id_vol], ctx.duree[id_vol]
+                    if (id_vol in planifies or not capacites.creneau_libre(t)
+                            or not planning.libre(k, t, duree) or index.penalite(id_vol, t)):
+                        continue
+                    poids = ctx.profit[id_vol] + lambda_utilisation * min(duree, deficit)
+                    if ponderation is not None:
+                        poids *= ponderation.get(id_vol, 0)
+                    if poids > 0:
+                        options.append((poids, t, t + duree, id_vol))
+
+            refus = False
+            ajouts = 0
+            for id_vol in intervalles_ponderes(options):
+                t = ctx.instant[id_vol]
+                if not capacites.disponible(id_vol, t) or index.penalite(id_vol, t):
+                    refus = True
+                    continue
+                vol = (k, id_vol, t)
+                planning.occuper(k, t, ctx.duree[id_vol])
+                capacites.reserver(id_vol, t)
+                index.ajouter_vol(vol)
+                planifies.add(id_vol)
+                solution.append(vol)
+                profit_total += ctx.profit[id_vol]
+                ajouts += 1
+            if not refus or not ajouts:
+                break
+
+    return solution, profit_total, planning
@@ -0,0 +1,39 @@
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+import heuristique
+from main import resoudre
+
+
+# Résolution d'un lot d'instances dans un seul processus, sans tracé : une
+# ligne par instance (score, temps). matplotlib n'est jamais importé et pulp
+# seulement pour la construction par relaxation (voir demarrage.py).
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Résout un lot d'instances sans affichage graphique.")
+    parser.add_argument("instances", nargs="*", help="fichiers d'instance (défaut : tout le dossier Instances)")
+    parser.add_argument("--temps", type=int, default=60, help="limite de temps par instance (s)")
+    parser.add_argument("--construction", default="glouton",
+                        choices=["glouton", "regret", "intervalles", "relaxation", "grasp"])
+    parser.add_argument("--voisinages", default="2", help="numéros des voisinages de heuristique.py, ex. 2,4,9")
+    parser.add_argument("--alns", action="store_true")
+    parser.add_argument("--polir", action="store_true", help="descente finale après le recuit")
+    parser.add_argument("--detail", action="store_true", help="affiche le détail de chaque résolution")
+    args = parser.parse_args()
+
+    fichiers = args.instances or sorted(os.path.join("Instances", nom) for nom in os.listdir("Instances")
+                                        if nom.endswith(".json"))
+    voisinages = tuple(getattr(heuristique, f"voisinage_{n}") for n in args.voisinages.split(","))
+    methode = "alns" if args.alns else "recuit"
+
+    total = 0
+    for fichier in fichiers:
+        debut = time.perf_counter()
+        with contextlib.redirect_stdout(sys.stdout if args.detail else io.StringIO()):
+            _, score = resoudre(fichier, args.temps, args.construction, voisinages, methode, polir=args.polir)
+        total += score
+        print(f"{os.path.basename(fichier):30s}{score:12.1f}{time.perf_counter() - debut:8.1f} s", flush=True)
+    print(f"{'total':30s}{total:12.1f}")
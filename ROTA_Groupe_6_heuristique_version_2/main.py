@@ -1,69 +1,165 @@
-import json
 import os
 import numpy as np
-import math
-import matplotlib.pyplot as plt
+import random
 import sys
 
-from heuristics.candidate import Candidate
-from heuristics.stop import MaxTime, NoImprovement
-from heuristics.optimizers import temperature_calibration, simulatedannealing
-from heuristics.state import State
-
-from heuristique import planifier_vols, fonction_evaluation, voisinage_1, voisinage_2
-
-def charger_donnees(fichier):
-    with open(fichier, 'r') as f:
-        return json.load(f)
-
-def creer_vols(donnees):
-    vols = []
-    for dest_index, destination in enumerate(donnees["destinations"]):
-        for t, profit in enumerate(destination["profit"]):
-            vols.append({
-                "vol": len(vols) + 1,
-                "destination": dest_index,
-                "time": t,
-                "profit": profit,
-                "flight_time": destination["flight_time"]
-            })
-    return vols
+from heuristics.candidate import InPlaceCandidate, MoveCandidate
+from heuristics.stop import MaxTime, NoImprovement, LocalOptimum
+from heuristics.optimizers import temperature_calibration, simulatedannealing, descent, alns
+
+import heuristique
+from heuristique import charger_donnees, planifier_vols, voisinage_2, voisinage_3, meilleur_decalage
+from contexte import ProblemContext
+from evaluation import evaluation_vectorielle
+from ordonnancement import Schedule
+from regret import planifier_regret
+from grasp import grasp
+from intervalles import planifier_intervalles
+from relaxation import planifier_relaxation
+import reconstruction
 
 class FlightPlanningModel:
-    def __init__(self, donnees, vols, lambda_esp, lambda_util):
-        self.donnees = donnees
-        self.vols = vols
+    def __init__(self, ctx, lambda_esp, lambda_util, construction="glouton",
+                 voisinages=(voisinage_2,)):
+        self.ctx = ctx
         self.lambda_esp = lambda_esp
         self.lambda_util = lambda_util
-
-    def cost(self, solution):
-        score, _, _, _ = fonction_evaluation(solution, self.donnees, self.lambda_esp, self.lambda_util, self.vols)
-        return score  # on maximise
+        # "glouton" (planifier_vols), "regret" (planifier_regret : insertion
+        # avec regret), "grasp" (grasp multi-départs),
+        # "intervalles" (planifier_intervalles) ou "relaxation" (relaxation
+        # linéaire arrondie, planifier_relaxation)
+        self.construction = construction
+        self.elites = []  # meilleures solutions du GRASP, (score, solution)
+        # Voisinages utilisés par neighbour, tirés au hasard à chaque pas. Un
+        # voisinage donné par sa classe (chaînes d'éjections) est instancié
+        # pour ce modèle : ses statistiques ne sont pas partagées entre recherches.
+        self.voisinages = tuple(voisinage() if isinstance(voisinage, type) else voisinage for voisinage in voisinages)
+
+    def cost(self, programme, mouvement=None):
+        # Score tenu à jour par l'évaluateur incrémental du programme ; avec un
+        # mouvement, score qu'aurait le programme après ce mouvement
+        return programme.score if mouvement is None else programme.score + mouvement.delta()  # on maximise
+
+    def candidat(self, programme):
+        # Le mouvement en cours est défait par la recherche s'il est rejeté ;
+        # le meilleur candidat est conservé au format (solution, planning, profit)
+        return InPlaceCandidate(programme, self.cost(programme), programme.annuler, Schedule.instantane)
 
     def initial(self):
-        solution, profit, planning = planifier_vols(self.vols, self.donnees)
-        return Candidate((solution, planning, profit), self.cost(solution))
+        if self.construction == "regret":
+            solution, profit, planning = planifier_regret(self.ctx, self.lambda_esp, self.lambda_util)
+        elif self.construction == "intervalles":
+            solution, profit, planning = planifier_intervalles(self.ctx, self.lambda_util)
+        elif self.construction == "relaxation":
+            solution, profit, planning = planifier_relaxation(self.ctx, self.lambda_esp, self.lambda_util)
+        elif self.construction == "grasp":
+            self.elites = grasp(self.ctx, self.lambda_esp, self.lambda_util)
+            solution, planning = self.elites[0][1], None
+        else:
+            solution, profit, planning = planifier_vols(self.ctx)
+        return self.candidat(Schedule(self.ctx, self.lambda_esp, self.lambda_util, solution, planning))
 
     def neighbour(self, candidate, state):
-        solution, planning, profit = candidate.x
-        new_solution, new_profit, new_planning = voisinage_2(solution, planning, profit, self.donnees, self.vols)
-        return Candidate((new_solution, new_planning, new_profit), self.cost(new_solution))
-
-def solve_flight_planning(donnees, vols, lambda_esp, lambda_util, time_limit=60, plot=False):
-    model = FlightPlanningModel(donnees, vols, lambda_esp, lambda_util)
+        # Le programme partagé est dans l'état du candidat courant : le
+        # mouvement précédent a été soit accepté (et appliqué), soit rejeté
+        # sans jamais avoir été appliqué
+        programme = candidate.x
+        programme.valider()
+        voisinage = random.choice(self.voisinages)
+        mouvement = next(voisinage(programme, self.ctx), None)
+        if mouvement is None:
+            return self.candidat(programme)
+        return MoveCandidate(programme, self.cost(programme, mouvement), mouvement.apply, Schedule.instantane)
+
+    def meilleur_voisin(self, candidate, state):
+        # Meilleur mouvement parmi toutes les insertions et tous les décalages
+        # de vols ; à un optimum local, le candidat est rendu inchangé et
+        # l'état de la recherche le signale
+        programme = candidate.x
+        programme.valider()
+        mouvements = [mouvement for mouvement in (next(voisinage_3(programme, self.ctx, meilleur=True), None),
+                                                  meilleur_decalage(programme, self.ctx))
+                      if mouvement is not None]
+        mouvement = max(mouvements, key=lambda mouvement: mouvement.delta(), default=None)
+        if state is not None:
+            state.local_optimum = mouvement is None
+        if mouvement is None:
+            return self.candidat(programme)
+        return MoveCandidate(programme, self.cost(programme, mouvement), mouvement.apply, Schedule.instantane)
+
+    def operateurs_alns(self, taux=(0.1, 0.3)):
+        # Opérateurs de destruction et de réparation pour alns. Une
+        # destruction retire entre taux[0] et taux[1] des vols planifiés.
+        def destruction(retirer):
+            def detruire(candidate, state):
+                programme = candidate.x
+                programme.valider()
+                n = len(programme.solution)
+                retirer(programme, self.ctx, random.randint(max(1, int(taux[0] * n)), max(1, int(taux[1] * n))))
+                return programme
+            detruire.__name__ = retirer.__name__
+            return detruire
+
+        def reparation(reparer):
+            def reconstruire(programme, state):
+                reparer(programme, self.ctx)
+                return self.candidat(programme)
+            reconstruire.__name__ = reparer.__name__
+            return reconstruire
+
+        destructions = [destruction(retirer) for retirer in (
+            reconstruction.retrait_aleatoire, reconstruction.retrait_pire_profit,
+            reconstruction.retrait_lie, reconstruction.retrait_fenetre)]
+        reparations = [reparation(reparer) for reparer in (
+            reconstruction.reparation_gloutonne, reconstruction.reparation_regret,
+            reconstruction.reparation_intervalles)]
+        return destructions, reparations
+
+    def polir(self, solution, planning):
+        # Descente en meilleure amélioration jusqu'à un optimum local
+        programme = Schedule(self.ctx, self.lambda_esp, self.lambda_util, solution, planning.copy())
+        return descent(self.candidat(programme), self.meilleur_voisin, LocalOptimum(), minimize=False)
+
+def solve_flight_planning(ctx, lambda_esp, lambda_util, time_limit=60, construction="glouton",
+                          voisinages=(voisinage_2,), methode="recuit", polir=False):
+    model = FlightPlanningModel(ctx, lambda_esp, lambda_util, construction=construction, voisinages=voisinages)
     s0 = model.initial()
-    T0 = temperature_calibration(s0, model.neighbour, 0.3, 1500)
+    if methode == "alns":
+        return solve_alns(model, s0, time_limit)
+    # La calibration accepte tous les mouvements : elle marche sur une copie
+    T0 = temperature_calibration(model.candidat(s0.x.copy()), model.neighbour, 0.3, 1500)
     temp = lambda t: T0 * np.exp(-t / 5000)
     stop = NoImprovement(10000)
-    
-
 
     result = simulatedannealing(s0, model.neighbour, temp, stop, minimize=False)
+    if polir:
+        # En option : descente jusqu'à un optimum local à partir de la
+        # meilleure solution du recuit
+        solution, planning, _ = result.best.x
+        poli = model.polir(solution, planning)
+        if poli.best.cost > result.best.cost:
+            result.best = poli.best
+    for voisinage in model.voisinages:
+        if hasattr(voisinage, "rapport"):  # statistiques propres au voisinage (chaînes d'éjections)
+            print(voisinage.rapport())
     return result
 
-def convergence(result):
-    result.plot_convergence()
-    plt.title("Convergence")
+# Recherche adaptative à grands voisinages : destructions et réparations de
+# plusieurs vols, pour sortir des plateaux des mouvements d'un seul vol
+def solve_alns(model, s0, time_limit):
+    destructions, reparations = model.operateurs_alns()
+
+    def grand_voisin(candidate, state):
+        return random.choice(reparations)(random.choice(destructions)(candidate, state), state)
+
+    # Les mouvements sont bien plus coûteux qu'en recuit : calibration et
+    # décroissance de la température sur moins d'itérations
+    T0 = temperature_calibration(model.candidat(s0.x.copy()), grand_voisin, 0.3, 50)
+    temp = lambda t: T0 * np.exp(-t / 500)
+    result = alns(s0, destructions, reparations, temp, MaxTime(time_limit), minimize=False)
+    for stats in result.operators.values():
+        print(stats)
+    return result
 
 def sauvegarder_solution(solution, instance_path):
     base_name = os.path.basename(instance_path).replace(".json", ".txt")
@@ -75,36 +171,53 @@ def sauvegarder_solution(solution, instance_path):
             f.write(f"{avion} {id_vol} {t}\n")
     print(f"Solution sauvegardée : {out_path}")
 
-if __name__ == "__main__":
-    if len(sys.argv) < 3:
-        print("Usage: python main.py <instance_file> <time_limit> [--plot]")
-        sys.exit(1)
-
-    fichier = sys.argv[1]
-    time_limit = int(sys.argv[2])
-    plot = "--plot" in sys.argv
-
+# Résolution complète d'une instance : chargement, recherche, affichage du
+# détail et sauvegarde de la meilleure solution. N'importe ni matplotlib ni
+# pulp (sauf construction par relaxation) : c'est aussi le point d'entrée des
+# résolutions par lots (voir lot.py).
+def resoudre(fichier, time_limit, construction="glouton", voisinages=(voisinage_2,), methode="recuit",
+             lambda_esp=20, lambda_util=20, polir=False):
     donnees = charger_donnees(fichier)
-    vols = creer_vols(donnees)
+    ctx = ProblemContext(donnees)
 
     # Paramètres des contraintes
-    lambda_esp, lambda_util = 20, 20 
     print("λ espacement :", lambda_esp)
     print("λ sous-utilisation :", lambda_util)
 
-    result = solve_flight_planning(donnees, vols, lambda_esp, lambda_util, time_limit, plot)
+    result = solve_flight_planning(ctx, lambda_esp, lambda_util, time_limit, construction=construction,
+                                   voisinages=voisinages, methode=methode, polir=polir)
     solution, _, _ = result.best.x
 
-    score, profit, pen_esp, pen_util = fonction_evaluation(solution, donnees, lambda_esp, lambda_util, vols)
+    score, profit, pen_esp, pen_util = evaluation_vectorielle(solution, ctx, lambda_esp, lambda_util)
     print(f"\nProfit : {profit}")
     print(f"Score final (avec pénalités) : {score}")
     print(f"Pénalité espacement : {pen_esp}, Pénalité sous-utilisation : {pen_util}\n")
 
     print("Meilleure solution trouvée :")
     for avion, id_vol, t in solution:
-        flight = vols[id_vol - 1]
-        print(f"Avion {avion} | Vol {id_vol} | Départ : {t} | Arrivée : {t + flight['flight_time']} | Destination {flight['destination']}")
+        print(f"Avion {avion} | Vol {id_vol} | Départ : {t} | Arrivée : {t + ctx.duree[id_vol]} | Destination {ctx.destination[id_vol]}")
 
     sauvegarder_solution(solution, fichier)
-    convergence(result)
-    plt.show()
+    return result, score
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Usage: python main.py <instance_file> <time_limit> [--plot] [--regret | --grasp | --intervalles | --relaxation]"
+              " [--voisinages=2,4,5,6,7,8,9] [--alns] [--polir]")
+        sys.exit(1)
+
+    fichier = sys.argv[1]
+    time_limit = int(sys.argv[2])
+    plot = "--plot" in sys.argv
+    construction = next((nom for nom in ("regret", "grasp", "intervalles", "relaxation") if f"--{nom}" in sys.argv), "glouton")
+    # Numéros des voisinages de heuristique.py (défaut : voisinage_2 seul)
+    numeros = next((arg.split("=", 1)[1] for arg in sys.argv if arg.startswith("--voisinages=")), "2")
+    voisinages = tuple(getattr(heuristique, f"voisinage_{n}") for n in numeros.split(","))
+    methode = "alns" if "--alns" in sys.argv else "recuit"
+    polir = "--polir" in sys.argv  # descente finale après le recuit
+
+    result, _ = resoudre(fichier, time_limit, construction, voisinages, methode, polir=polir)
+    if plot:
+        from affichage import convergence, afficher  # matplotlib, seulement si on trace
+        convergence(result)
+        afficher()
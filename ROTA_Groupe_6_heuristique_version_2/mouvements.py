@@ -0,0 +1,97 @@
+# Mouvement sur un Schedule (voir ordonnancement.py) : vols à retirer puis
+# vols à insérer. Un mouvement ne contient que ces deux tuples ; il peut être
+# évalué sans toucher au programme (delta), appliqué sur place (apply) puis
+# défait (undo), en O(taille du mouvement).
+class Move:
+    __slots__ = ("programme", "retraits", "insertions", "repere")
+
+    def __init__(self, programme, retraits=(), insertions=()):
+        self.programme = programme
+        self.retraits = retraits
+        self.insertions = insertions
+        self.repere = None  # longueur du journal du programme avant apply()
+
+    def __repr__(self):
+        return f"Move(-{self.retraits}, +{self.insertions})"
+
+    def delta(self):
+        # Variation du score si le mouvement était appliqué
+        return self.programme.evaluateur.delta(self.retraits, self.insertions)
+
+    def apply(self):
+        programme = self.programme
+        self.repere = len(programme.journal)
+        for vol in self.retraits:
+            programme.retirer(vol)
+        for vol in self.insertions:
+            programme.inserer(vol)
+
+    def undo(self):
+        # Défait ce mouvement seulement (il doit être le dernier appliqué)
+        self.programme.annuler(self.repere)
+        self.repere = None
+
+    def flotte_libre(self):
+        # Chaque vol inséré trouve son avion libre, une fois les retraits faits
+        # et les insertions précédentes placées
+        planning, duree = self.programme.planning, self.programme.ctx.duree
+        masques = {}
+        for avion, id_vol, t in self.retraits:
+            masques[avion] = masques.get(avion, planning.masques[avion]) & ~planning.fenetre(t, duree[id_vol])
+        for avion, id_vol, t in self.insertions:
+            masque = masques.get(avion, planning.masques[avion])
+            fenetre = planning.fenetre(t, duree[id_vol])
+            if t < 0 or t + duree[id_vol] > planning.Tmax or masque & fenetre:
+                return False
+            masques[avion] = masque | fenetre
+        return True
+
+    def sans_conflit(self):
+        # Aucun vol inséré n'est en conflit d'espacement (au sens de
+        # SpacingIndex.en_conflit) avec les vols restants ou les autres insertions
+        programme = self.programme
+        ctx, index = programme.ctx, programme.index
+        retires = {(t, id_vol) for _, id_vol, t in self.retraits}
+        for n, (_, id_vol, t) in enumerate(self.insertions):
+            if any(voisin not in retires for voisin in index.voisins(id_vol, t)):
+                return False
+            arrivee = t + ctx.duree[id_vol]
+            for _, autre_id, autre_t in self.insertions[:n]:
+                if (autre_id != id_vol and ctx.destination[autre_id] == ctx.destination[id_vol]
+                        and (abs(arrivee - autre_t) < ctx.min_spacing
+                             or abs(autre_t + ctx.duree[autre_id] - t) < ctx.min_spacing)):
+                    return False
+        return True
+
+
+# Mouvement qui ne fait que changer d'avion des vols planifiés (mêmes vols,
+# mêmes départs) : profit, créneaux, nombre de vols et espacement sont
+# inchangés, seul le temps de vol des avions touchés varie. Le delta ne
+# dépend que de ces avions, quelle que soit la taille de la solution.
+class Transfert(Move):
+    __slots__ = ()
+
+    def delta(self):
+        duree = self.programme.ctx.duree
+        variations = {}
+        for avion, id_vol, _ in self.retraits:
+            variations[avion] = variations.get(avion, 0) - duree[id_vol]
+        for avion, id_vol, _ in self.insertions:
+            variations[avion] = variations.get(avion, 0) + duree[id_vol]
+        return self.programme.evaluateur.delta_utilisation(variations)
+
+
+# Retrait d'un vol planifié
+def retrait(programme, vol):
+    return Move(programme, (vol,))
+
+
+# Insertion d'un vol non planifié
+def insertion(programme, vol):
+    return Move(programme, (), (vol,))
+
+
+# Remplacement d'un vol planifié par un autre (éventuellement le même vol à
+# un autre horaire ou sur un autre avion)
+def remplacement(programme, ancien, nouveau):
+    return Move(programme, (ancien,), (nouveau,))
@@ -0,0 +1,150 @@
+from collections import Counter
+
+from capacite import CapacityLedger
+from ensembles import DontLookBits, FlightPool
+from espacement import DepartureIndex
+from evaluation import IncrementalEvaluator
+from flotte import FleetAvailability
+
+
+# Solution modifiable sur place : liste des vols, disponibilité de la flotte,
+# capacités restantes et évaluation incrémentale tenues à jour ensemble.
+# Chaque retrait ou insertion est noté dans un journal ; annuler() rétablit
+# l'état du dernier valider() en O(taille du mouvement), sans aucune copie.
+# L'ordre de la liste est lui aussi rétabli à l'identique.
+class Schedule:
+    def __init__(self, ctx, lambda_espacement, lambda_utilisation, solution=(), planning=None):
+        self.ctx = ctx
+        self.solution = []
+        self.positions = {}  # vol (avion, id, départ) -> rang dans self.solution
+        self.occurrences = Counter()  # id du vol -> nombre de fois où il est planifié
+        # Vols planifiés, et vols non planifiés pouvant l'être (arrivée dans l'horizon)
+        self.planifies = FlightPool(ctx)
+        self.non_planifies = FlightPool(ctx, (id_vol for id_vol in range(1, ctx.n_vols + 1)
+                                              if self.realisable(id_vol)))
+        self.evaluateur = IncrementalEvaluator(ctx, lambda_espacement, lambda_utilisation)
+        self.capacites = CapacityLedger(ctx)
+        self.planning = planning if planning is not None else FleetAvailability(ctx.n_avions, ctx.Tmax)
+        self.par_avion = DepartureIndex(ctx.n_avions)  # départs par avion (identifiants des vols)
+        self.avions = {}  # (id du vol, départ) -> avion qui le porte
+        for vol in solution:
+            if planning is None:
+                self.planning.occuper(vol[0], vol[2], ctx.duree[vol[1]])
+            self._ajouter(vol)
+        self.journal = []
+        self._ne_pas_regarder = None  # construits à la première demande
+
+    def _ajouter(self, vol):
+        self.positions[vol] = len(self.solution)
+        self.solution.append(vol)
+        self.occurrences[vol[1]] += 1
+        if self.occurrences[vol[1]] == 1:
+            self.planifies.ajouter(vol[1])
+            self.non_planifies.retirer(vol[1])
+        self.capacites.reserver(vol[1], vol[2])
+        self.evaluateur.inserer(vol)
+        self.par_avion.ajouter(vol[0], vol[2], vol[1])
+        self.avions[vol[1], vol[2]] = vol[0]
+
+    def _enlever(self, vol):
+        # Retrait par échange avec le dernier vol de la liste, en O(1)
+        i = self.positions.pop(vol)
+        dernier = self.solution.pop()
+        if dernier != vol:
+            self.solution[i] = dernier
+            self.positions[dernier] = i
+        self.occurrences[vol[1]] -= 1
+        if self.occurrences[vol[1]] == 0:
+            self.planifies.retirer(vol[1])
+            if self.realisable(vol[1]):
+                self.non_planifies.ajouter(vol[1])
+        self.capacites.liberer(vol[1], vol[2])
+        self.evaluateur.retirer(vol)
+        self.par_avion.retirer(vol[0], vol[2], vol[1])
+        if self.avions.get((vol[1], vol[2])) == vol[0]:
+            del self.avions[vol[1], vol[2]]
+        return i
+
+    def inserer(self, vol):
+        avion, id_vol, t = vol
+        self.journal.append((True, vol, None, self.planning.masques[avion]))
+        self.planning.occuper(avion, t, self.ctx.duree[id_vol])
+        self._ajouter(vol)
+
+    def retirer(self, vol):
+        avion, id_vol, t = vol
+        masque = self.planning.masques[avion]
+        self.planning.liberer(avion, t, self.ctx.duree[id_vol])
+        self.journal.append((False, vol, self._enlever(vol), masque))
+
+    def annuler(self, jusqua=0):
+        # Défait, du plus récent au plus ancien, les mouvements du journal
+        # postérieurs à sa position `jusqua` (tous par défaut)
+        while len(self.journal) > jusqua:
+            insertion, vol, position, masque = self.journal.pop()
+            if insertion:
+                self._enlever(vol)
+            else:
+                self._ajouter(vol)
+                # Le vol reprend sa place, le vol qui l'occupait retourne en fin de liste
+                dernier = self.solution[position]
+                self.solution[position], self.solution[-1] = vol, dernier
+                self.positions[vol], self.positions[dernier] = position, len(self.solution) - 1
+            self.planning.restaurer(vol[0], masque)
+
+    def valider(self):
+        # Le mouvement en cours devient définitif ; les vols qu'il touche
+        # perdent leur bit "ne pas regarder"
+        if self._ne_pas_regarder is not None:
+            for _, vol, _, _ in self.journal:
+                self._ne_pas_regarder.signaler(vol)
+        self.journal.clear()
+
+    @property
+    def ne_pas_regarder(self):
+        # Vols que les examens exhaustifs peuvent sauter (voir DontLookBits)
+        if self._ne_pas_regarder is None:
+            self._ne_pas_regarder = DontLookBits(self)
+        return self._ne_pas_regarder
+
+    def vols_avion(self, avion):
+        # Vols planifiés de l'avion, par départ croissant
+        return [(avion, id_vol, t) for t, id_vol in zip(self.par_avion.departs[avion], self.par_avion.ids[avion])]
+
+    def vols_partant(self, id_vol, t):
+        # Vols planifiés (avion, id_vol, t). Un vol planifié une seule fois
+        # est trouvé directement ; sinon, on essaie les avions occupés à t.
+        if self.occurrences[id_vol] <= 1:
+            avion = self.avions.get((id_vol, t))
+            return [] if avion is None else [(avion, id_vol, t)]
+        bit = 1 << t
+        return [(avion, id_vol, t) for avion, masque in enumerate(self.planning.masques)
+                if masque & bit and (avion, id_vol, t) in self.positions]
+
+    def contient(self, id_vol):
+        return id_vol in self.planifies
+
+    def realisable(self, id_vol):
+        # Le vol, à son horaire, arrive avant la fin de l'horizon
+        return self.ctx.instant[id_vol] + self.ctx.duree[id_vol] <= self.ctx.Tmax
+
+    @property
+    def index(self):
+        # Départs par destination des vols planifiés (contrainte d'espacement)
+        return self.evaluateur.index
+
+    @property
+    def profit_total(self):
+        return self.evaluateur.profit_total
+
+    @property
+    def score(self):
+        return self.evaluateur.score
+
+    def copy(self):
+        return Schedule(self.ctx, self.evaluateur.lambda_espacement, self.evaluateur.lambda_utilisation,
+                        self.solution, self.planning.copy())
+
+    def instantane(self):
+        # Copie figée au format historique (solution, planning, profit_total)
+        return self.solution[:], self.planning.copy(), self.profit_total
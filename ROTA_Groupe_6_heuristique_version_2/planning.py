@@ -0,0 +1,45 @@
+# Matrice de disponibilité des avions sous forme de masques de bits :
+# un entier par avion, le bit t vaut 1 si l'avion est en vol à l'instant t.
+# Tester, occuper ou libérer une fenêtre [t, t + duree) se fait en une seule
+# opération sur l'entier, et copier le planning ne coûte que O(m).
+class Planning:
+    def __init__(self, n_avions, Tmax, masques=None):
+        self.n_avions = n_avions
+        self.Tmax = Tmax
+        self.horizon = (1 << Tmax) - 1
+        self.masques = masques if masques is not None else [0] * n_avions
+
+    def copy(self):
+        return Planning(self.n_avions, self.Tmax, self.masques[:])
+
+    def __len__(self):
+        return self.n_avions
+
+    def __eq__(self, autre):
+        return isinstance(autre, Planning) and self.masques == autre.masques
+
+    @staticmethod
+    def fenetre(t, duree):
+        return ((1 << duree) - 1) << t
+
+    def libre(self, k, t, duree):
+        # Fenêtre [t, t + duree) libre pour l'avion k et contenue dans l'horizon
+        return t >= 0 and t + duree <= self.Tmax and not self.masques[k] & self.fenetre(t, duree)
+
+    def occuper(self, k, t, duree):
+        self.masques[k] |= self.fenetre(t, duree) & self.horizon
+
+    def liberer(self, k, t, duree):
+        self.masques[k] &= ~self.fenetre(t, duree)
+
+    def restaurer(self, k, masque):
+        # Remet la ligne de l'avion k dans un état mémorisé (annulation d'un mouvement)
+        self.masques[k] = masque
+
+    def occupation(self, k):
+        # Nombre d'instants où l'avion k est en vol
+        return self.masques[k].bit_count()
+
+    def lignes(self):
+        # Ancienne représentation : liste de listes de 0/1
+        return [[(masque >> t) & 1 for t in range(self.Tmax)] for masque in self.masques]
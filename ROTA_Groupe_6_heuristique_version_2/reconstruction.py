@@ -0,0 +1,95 @@
+import random
+
+import numpy as np
+
+from gains import gains_insertion, meilleure_insertion
+from intervalles import intervalles_ponderes
+
+
+# Opérateurs de destruction et de réparation de la recherche à grands
+# voisinages (alns de heuristics.optimizers). Ils modifient le Schedule sur
+# place : destruction et réparation forment un seul mouvement du journal,
+# défait d'un bloc par programme.annuler() si le résultat est rejeté.
+
+# Tirage biaisé vers le début d'une liste triée (plus `biais` est grand,
+# plus on choisit les premiers éléments)
+def _rang_biaise(n, biais=3):
+    return int(n * random.random() ** biais)
+
+
+# Destruction : q vols tirés au hasard
+def retrait_aleatoire(programme, ctx, q):
+    for vol in random.sample(programme.solution, min(q, len(programme.solution))):
+        programme.retirer(vol)
+
+
+# Destruction : les vols qui rapportent le moins au score (profit, moins les
+# pénalités qu'ils créent), avec un tirage biaisé pour varier
+def retrait_pire_profit(programme, ctx, q):
+    evaluateur = programme.evaluateur
+    vols = sorted(programme.solution, key=lambda vol: -evaluateur.delta_retrait(vol))
+    for _ in range(min(q, len(vols))):
+        programme.retirer(vols.pop(_rang_biaise(len(vols))))
+
+
+# Destruction : un vol tiré au hasard et les vols qui lui sont liés, d'abord
+# ceux de la même destination puis les plus proches dans le temps
+def retrait_lie(programme, ctx, q):
+    if not programme.solution:
+        return
+    _, id_graine, t_graine = random.choice(programme.solution)
+    destination = ctx.destination[id_graine]
+
+    def distance(vol):
+        return abs(vol[2] - t_graine) + (ctx.Tmax if ctx.destination[vol[1]] != destination else 0)
+
+    vols = sorted(programme.solution, key=distance)
+    for _ in range(min(q, len(vols))):
+        programme.retirer(vols.pop(_rang_biaise(len(vols))))
+
+
+# Destruction : q vols consécutifs dans le temps, à partir d'un départ tiré au hasard
+def retrait_fenetre(programme, ctx, q):
+    vols = sorted(programme.solution, key=lambda vol: vol[2])
+    debut = random.randrange(max(len(vols) - q, 0) + 1)
+    for vol in vols[debut:debut + q]:
+        programme.retirer(vol)
+
+
+# Réparation gloutonne : meilleure insertion tant qu'elle améliore le score
+def reparation_gloutonne(programme, ctx):
+    while (mouvement := meilleure_insertion(programme, ctx)) is not None:
+        mouvement.apply()
+
+
+# Réparation par regret : on insère d'abord le vol dont la meilleure option
+# dépasse le plus les k - 1 suivantes (mêmes priorités que planifier_regret)
+def reparation_regret(programme, ctx, k=2):
+    while True:
+        gains = gains_insertion(programme, ctx)
+        meilleures = -np.sort(-gains, axis=1)[:, :k]
+        v1 = meilleures[:, 0]
+        meilleures = np.where(meilleures > 0, meilleures, 0.0)
+        priorite = np.where(v1 > 0, v1 + (v1[:, None] - meilleures[:, 1:]).sum(axis=1), -np.inf)
+        ligne = int(np.argmax(priorite))
+        if priorite[ligne] == -np.inf:
+            return
+        programme.inserer((int(np.argmax(gains[ligne])), ligne + 1, ligne % ctx.Tmax))
+
+
+# Réparation par intervalles pondérés : avion par avion, du moins utilisé au
+# plus utilisé, la sélection optimale d'insertions disjointes pondérées par
+# leur gain (voir intervalles.py). Chaque vol est revérifié à l'insertion.
+def reparation_intervalles(programme, ctx):
+    evaluateur = programme.evaluateur
+    for k in sorted(range(ctx.n_avions), key=lambda k: evaluateur.utilisation[k]):
+        gains = gains_insertion(programme, ctx)[:, k]
+        lignes = np.flatnonzero(gains > 0).tolist()
+        options = [(gains[ligne], ligne % ctx.Tmax, ligne % ctx.Tmax + ctx.duree[ligne + 1], ligne + 1)
+                   for ligne in lignes]
+        for id_vol in intervalles_ponderes(options):
+            vol = (k, id_vol, ctx.instant[id_vol])
+            if (programme.capacites.disponible(id_vol, vol[2])
+                    and programme.planning.libre(k, vol[2], ctx.duree[id_vol])
+                    and evaluateur.delta_insertion(vol) > 0):
+                programme.inserer(vol)
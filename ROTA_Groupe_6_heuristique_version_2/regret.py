@@ -0,0 +1,217 @@
+import heapq
+import math
+
+import numpy as np
+
+from flotte import FleetAvailability
+
+
+# Meilleurs plans d'un avion sur la grille des instants. `poids` est un
+# tableau D x T (-inf pour une option interdite) ; programmation dynamique
+# sur les instants : avant[e] est la meilleure valeur d'un plan terminé au
+# plus tard en e, apres[t] celle d'un plan commencé au plus tôt en t.
+# Renvoie aussi les lignes (d * T + t) d'un plan optimal.
+def plans_avion(poids, durees, T):
+    D = len(durees)
+    poids = poids.tolist()
+    avant = [0.0] * (T + 1)
+    for e in range(1, T + 1):
+        meilleur = avant[e - 1]
+        for d in range(D):
+            t = e - durees[d]
+            if t >= 0 and poids[d][t] > -math.inf:
+                meilleur = max(meilleur, poids[d][t] + avant[t])
+        avant[e] = meilleur
+    apres = [0.0] * (T + 1)
+    for t in range(T - 1, -1, -1):
+        meilleur = apres[t + 1]
+        for d in range(D):
+            e = t + durees[d]
+            if e <= T and poids[d][t] > -math.inf:
+                meilleur = max(meilleur, poids[d][t] + apres[e])
+        apres[t] = meilleur
+
+    plan = set()
+    e = T
+    while e > 0:
+        if avant[e] == avant[e - 1]:
+            e -= 1
+            continue
+        for d in range(D):
+            t = e - durees[d]
+            if t >= 0 and poids[d][t] > -math.inf and abs(poids[d][t] + avant[t] - avant[e]) < 1e-6:
+                plan.add(d * T + t)
+                e = t
+                break
+        else:
+            e -= 1
+    return np.array(avant), np.array(apres), plan
+
+
+# Construction par insertion avec regret.
+# Une option est un couple (vol, avion). Son gain est la variation exacte du
+# score si l'on insère le vol sur l'avion : profit, plus λu fois la baisse de
+# pénalité de sous-utilisation de l'avion, moins λe fois la pénalité
+# d'espacement créée avec les vols déjà planifiés. Sa valeur est ce gain
+# moins son coût d'opportunité : ce que perd le meilleur plan de l'avion
+# (plans_avion) s'il doit contenir le vol. Un vol bien payé qui casse le
+# remplissage de l'avion, ou qui prend la place d'un meilleur vol, perd
+# ainsi sa priorité.
+# Chaque avion planifie seul ; pour que les plans ne se disputent pas les
+# mêmes créneaux et les mêmes vols d'une destination, les poids des plans
+# retranchent des prix (relaxation lagrangienne des créneaux et des nombres
+# de vols), ajustés en `iterations` passes par sous-gradient, avec le pas
+# `pas`, selon l'excès de demande des plans.
+# Priorité d'un vol : v1 + somme_{j=2..k} (v1 - vj), où v1 >= v2 >= ... sont
+# les valeurs de ses meilleures options (0 pour une option manquante). On
+# insère à chaque étape le vol de plus forte priorité sur sa meilleure
+# option. Les priorités sont dans un tas, invalidé paresseusement par un
+# numéro de version par ligne. Après une insertion, on ne réévalue que les
+# lignes touchées : vols de la même destination proches du nouveau vol, et
+# colonnes des avions dont le plan change (l'avion du vol, ceux dont le plan
+# contenait un vol devenu impossible). Les prix ne sont recalculés que dans
+# ce second cas.
+def planifier_regret(ctx, lambda_espacement, lambda_utilisation, k=2, iterations=4, pas=0.5):
+    D, T, m = ctx.n_destinations, ctx.Tmax, ctx.n_avions
+    k = max(1, min(k, m))
+    s = ctx.min_spacing
+    durees = [destination["flight_time"] for destination in ctx.donnees["destinations"]]
+    vols_restants = [destination["n_flights"] for destination in ctx.donnees["destinations"]]
+    creneaux = ctx.slots[:]
+
+    # Lignes : vol id - 1 (destination d, instant t) -> ligne d * T + t
+    instants = np.tile(np.arange(T), D)
+    destinations = np.repeat(np.arange(D), T)
+    duree = ctx.np_duree[1:]
+    fin = np.minimum(instants + duree, T)
+    profit = ctx.np_profit[1:]
+    table = ctx.penalite_par_utilisation
+    plafond = len(table) - 1
+    n = len(instants)
+
+    vivant = ((instants + duree <= T) & (np.array(creneaux)[instants] > 0)
+              & (np.repeat(vols_restants, T) > 0))
+    libre = np.ones((n, m), dtype=bool)  # (vol, avion) : l'avion est libre
+    conflit = np.zeros(n, dtype=np.int64)  # pénalité d'espacement qu'ajouterait le vol
+    utilisation = np.zeros(m, dtype=np.int64)
+    prix = np.zeros(n)
+    plans = [None] * m  # avion -> (avant, apres, lignes du plan)
+    valeurs = np.full((n, m), -np.inf)
+    version = np.zeros(n, dtype=np.int64)
+    tas = []
+
+    def gains(lignes, avion):
+        u = utilisation[avion]
+        return (profit[lignes] - lambda_espacement * conflit[lignes]
+                + lambda_utilisation * (table[min(u, plafond)] - table[np.minimum(u + duree[lignes], plafond)]))
+
+    def evaluer(lignes, avion):
+        # Valeurs des options des lignes données sur un avion, avec son plan courant
+        gain = gains(lignes, avion)
+        ok = libre[lignes, avion] & vivant[lignes] & (gain > 0)
+        avant, apres, _ = plans[avion]
+        v = gain - (avant[T] - (avant[instants[lignes]] + gain - prix[lignes] + apres[fin[lignes]]))
+        return np.where(ok & (v > 0), v, -np.inf)
+
+    def planifier(avion):
+        gain = gains(slice(None), avion)
+        poids = np.where(libre[:, avion] & vivant & (gain > 0), gain - prix, -np.inf)
+        plans[avion] = plans_avion(poids.reshape(D, T), durees, T)
+        return gain[np.isfinite(poids)]
+
+    def fixer_prix():
+        prix_destination, prix_creneau = np.zeros(D), np.zeros(T)
+        prix[:] = 0
+        for iteration in range(iterations):
+            demande_destination, demande_creneau = np.zeros(D), np.zeros(T)
+            possibles = []
+            for avion in range(m):
+                possibles.append(planifier(avion))
+                plan = np.fromiter(plans[avion][2], dtype=np.int64)
+                demande_destination += np.bincount(destinations[plan], minlength=D)
+                demande_creneau += np.bincount(instants[plan], minlength=T)
+            if iteration == iterations - 1:
+                break
+            possibles = np.concatenate(possibles)
+            echelle = pas * (np.median(possibles) if len(possibles) else 0) / m
+            prix_destination = np.maximum(0, prix_destination + echelle * (demande_destination - vols_restants))
+            prix_creneau = np.maximum(0, prix_creneau + echelle * (demande_creneau - creneaux))
+            prix[:] = prix_destination[destinations] + prix_creneau[instants]
+
+    def mettre_a_jour(lignes):
+        lignes = lignes[vivant[lignes]]
+        meilleures = -np.sort(-valeurs[lignes], axis=1)[:, :k]
+        v1 = meilleures[:, 0]
+        meilleures = np.where(np.isfinite(meilleures), meilleures, 0.0)
+        priorite = v1 + (v1[:, None] - meilleures[:, 1:]).sum(axis=1)
+        version[lignes] += 1
+        for ligne, p in zip(lignes[np.isfinite(v1)].tolist(), priorite[np.isfinite(v1)].tolist()):
+            heapq.heappush(tas, (-p, ligne, version[ligne]))
+
+    fixer_prix()
+    for avion in range(m):
+        valeurs[:, avion] = evaluer(slice(None), avion)
+    mettre_a_jour(np.flatnonzero(vivant))
+    planning = FleetAvailability(m, T)
+    solution = []
+    profit_total = 0
+
+    while tas:
+        _, ligne, numero = heapq.heappop(tas)
+        if numero != version[ligne] or not vivant[ligne]:
+            continue
+        avion = int(np.argmax(valeurs[ligne]))
+        destination, t = divmod(ligne, T)
+        id_vol, d = ligne + 1, durees[destination]
+        planning.occuper(avion, t, d)
+        solution.append((avion, id_vol, t))
+        profit_total += ctx.profit[id_vol]
+        supprimees = [ligne]
+        touchees = []
+
+        # Créneau du hub et nombre de vols de la destination
+        creneaux[t] -= 1
+        if creneaux[t] <= 0:
+            supprimees.extend(id_autre - 1 for id_autre in ctx.vols_par_instant[t])
+        vols_restants[destination] -= 1
+        debut = destination * T
+        if vols_restants[destination] <= 0:
+            supprimees.extend(range(debut, debut + T))
+        else:
+            # Espacement : les départs t' avec |t' + d - t| < s ou |t + d - t'| < s
+            # paieraient désormais une pénalité avec le nouveau vol
+            for centre in (t - d, t + d):
+                a, b = max(centre - s + 1, 0), min(centre + s, T)
+                if a < b:
+                    conflit[debut + a:debut + b] += s - np.abs(np.arange(a, b) - centre)
+                    touchees.append(np.arange(debut + a, debut + b))
+        supprimees = {ligne for ligne in supprimees if vivant[ligne]}
+        vivant[list(supprimees)] = False
+        valeurs[list(supprimees)] = -np.inf
+
+        # L'avion n'est plus libre pour les vols qui chevauchent [t, t + d)
+        for autre, duree_autre in enumerate(durees):
+            a, b = max(t - duree_autre + 1, 0), min(t + d, T)
+            if a < b:
+                libre[autre * T + a:autre * T + b, avion] = False
+        utilisation[avion] += d
+
+        # Plans à refaire : celui de l'avion, ceux qui comptaient sur un vol supprimé
+        modifies = [avion] + [autre for autre in range(m) if autre != avion and plans[autre][2] & supprimees]
+        if len(modifies) > 1:
+            fixer_prix()
+            modifies = range(m)
+        else:
+            planifier(avion)
+        for autre in modifies:
+            colonne = evaluer(slice(None), autre)
+            touchees.append(np.flatnonzero(colonne != valeurs[:, autre]))
+            valeurs[:, autre] = colonne
+        if touchees:
+            lignes = np.unique(np.concatenate(touchees))
+            lignes = lignes[vivant[lignes]]
+            for autre in range(m):
+                valeurs[lignes, autre] = evaluer(lignes, autre)
+            mettre_a_jour(lignes)
+
+    return solution, profit_total, planning
@@ -0,0 +1,101 @@
+from heuristique import planifier_vols
+from intervalles import planifier_intervalles
+from ordonnancement import Schedule
+
+
+# Relaxation linéaire réduite du modèle PuLP de ROTA/main.
+# Les avions et les numéros de vol d'une même destination y sont
+# interchangeables : on les agrège en une variable y[d, t] dans [0, 1], le
+# nombre de départs vers d à l'instant t, soit D x T variables au lieu de
+# m x (vols) x T. Contraintes reprises :
+#   - créneaux du hub : somme_d y[d, t] <= slots[t] ;
+#   - nombre de vols : somme_t y[d, t] <= n_flights[d] ;
+#   - espacement : au plus un départ vers d sur toute fenêtre [t, t + min_spacing) ;
+#   - flotte : au plus m avions en vol à chaque instant ;
+#   - arrivée avant la fin de l'horizon.
+# L'utilisation minimale devient une pénalité λu sur le manque d'heures de
+# vol de la flotte entière. Renvoie le statut du solveur et
+# {id du vol: valeur de y} pour y > 0, vide si le statut n'est pas "Optimal".
+def relaxation_lineaire(ctx, lambda_utilisation, temps_limite=10):
+    import pulp  # dépendance optionnelle, seulement pour ce mode
+
+    T, m, s = ctx.Tmax, ctx.n_avions, ctx.min_spacing
+    destinations = ctx.donnees["destinations"]
+    prob = pulp.LpProblem("relaxation", pulp.LpMaximize)
+    y = {}
+    for d, destination in enumerate(destinations):
+        for t in range(T - destination["flight_time"] + 1):
+            y[d, t] = pulp.LpVariable(f"y_{d}_{t}", 0, 1)
+    manque = pulp.LpVariable("manque", 0)
+
+    prob += (pulp.lpSum(destinations[d]["profit"][t] * var for (d, t), var in y.items())
+             - lambda_utilisation * manque)
+
+    par_instant = [[] for _ in range(T)]
+    for (d, t), var in y.items():
+        par_instant[t].append(var)
+    for t in range(T):
+        prob += pulp.lpSum(par_instant[t]) <= ctx.slots[t]
+
+    for d, destination in enumerate(destinations):
+        prob += pulp.lpSum(y[d, t] for t in range(T) if (d, t) in y) <= destination["n_flights"]
+        for t in range(T - s + 1):
+            prob += pulp.lpSum(y[d, u] for u in range(t, t + s) if (d, u) in y) <= 1
+
+    for t in range(T):
+        prob += pulp.lpSum(y[d, u] for d, destination in enumerate(destinations)
+                           for u in range(max(t - destination["flight_time"] + 1, 0), t + 1) if (d, u) in y) <= m
+
+    prob += (pulp.lpSum(destinations[d]["flight_time"] * var for (d, t), var in y.items()) + manque
+             >= ctx.min_utilisation * T * m)
+
+    prob.solve(pulp.PULP_CBC_CMD(timeLimit=temps_limite, msg=False))
+    statut = pulp.LpStatus[prob.status]
+    if statut != "Optimal":
+        return statut, {}
+    return statut, {ctx.id_vol(d, t): var.value() for (d, t), var in y.items() if var.value() and var.value() > 1e-6}
+
+
+# Solution initiale guidée par la relaxation. Arrondi : la construction par
+# intervalles pondérés, avec des poids multipliés par la valeur fractionnaire
+# de chaque vol, de sorte que chaque avion reçoive la meilleure séquence
+# compatible parmi les vols retenus par la relaxation. Réparation : les vols
+# restants sont proposés par profit décroissant et insérés s'ils respectent
+# créneaux, nombre de vols et espacement et s'ils améliorent le score, sur
+# l'avion libre où ils l'améliorent le plus ; à égalité, sur celui dont
+# l'intervalle libre autour du vol est le plus court, pour garder les grands
+# intervalles aux vols longs.
+# Si le solveur ne rend pas de solution optimale (problème infaisable, non
+# résolu, limite de temps atteinte sans solution), on se replie sur la
+# construction gloutonne.
+def planifier_relaxation(ctx, lambda_espacement, lambda_utilisation, temps_limite=10):
+    statut, valeurs = relaxation_lineaire(ctx, lambda_utilisation, temps_limite)
+    if statut != "Optimal":
+        print(f"Relaxation linéaire : statut {statut}, repli sur la construction gloutonne")
+        return planifier_vols(ctx)
+    solution, _, planning = planifier_intervalles(ctx, lambda_utilisation, valeurs)
+
+    programme = Schedule(ctx, lambda_espacement, lambda_utilisation, solution, planning)
+    evaluateur = programme.evaluateur
+    for id_vol in ctx.vols_par_profit:
+        t, duree = ctx.instant[id_vol], ctx.duree[id_vol]
+        if (programme.contient(id_vol) or t + duree > ctx.Tmax
+                or not programme.capacites.disponible(id_vol, t) or programme.index.penalite(id_vol, t)):
+            continue
+        options = [(evaluateur.delta_insertion((k, id_vol, t)), -intervalle_libre(programme.planning, k, t, duree), k)
+                   for k in programme.planning.avions_libres(t, duree)]
+        if options:
+            delta, _, k = max(options)
+            if delta > 0:
+                programme.inserer((k, id_vol, t))
+    programme.valider()
+    return programme.solution, programme.profit_total, programme.planning
+
+
+# Longueur de l'intervalle libre de l'avion k qui contient [t, t + duree)
+def intervalle_libre(planning, k, t, duree):
+    masque = planning.masques[k]
+    debut = (masque & ((1 << t) - 1)).bit_length()
+    apres = masque >> (t + duree)
+    fin = t + duree + (apres & -apres).bit_length() - 1 if apres else planning.Tmax
+    return fin - debut
@@ -0,0 +1,200 @@
+import argparse
+import os
+import sys
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+
+from contexte import charger_contexte
+from espacement import SpacingIndex
+from evaluation import evaluer_tableaux
+
+
+# Validation d'un fichier solution face à son instance.
+# Formats de ligne acceptés :
+#   - "vol"         : avion id_vol départ              (sauvegarder_solution de main.py)
+#   - "destination" : avion destination départ         (solve de ROTA/main)
+#   - 4 colonnes    : avion vol destination départ     (fichiers de ROTA/Solution)
+# En format "auto", 4 colonnes donnent le dernier format ; sur 3 colonnes, un
+# fichier nommé solution-*.txt (convention de ROTA/main) est lu en
+# "destination", les autres en "vol".
+
+LAMBDA_ESPACEMENT, LAMBDA_UTILISATION = 20, 20
+
+
+def format_du_fichier(chemin, format_lignes, n_colonnes):
+    if format_lignes != "auto":
+        return format_lignes
+    if n_colonnes == 4:
+        return "milp"
+    if os.path.basename(chemin).startswith("solution-"):
+        return "destination"
+    return "vol"
+
+
+# Lecture en flux : (numéro de ligne, avion, destination, départ, id_vol), plus les erreurs de lecture
+def lire_solution(chemin, ctx, format_lignes="auto"):
+    vols, erreurs = [], []
+    format_fichier = None
+    with open(chemin) as f:
+        for numero, ligne in enumerate(f, start=1):
+            champs = ligne.split()
+            if not champs:
+                continue
+            if format_fichier is None:
+                format_fichier = format_du_fichier(chemin, format_lignes, len(champs))
+            attendu = 4 if format_fichier == "milp" else 3
+            try:
+                valeurs = [int(champ) for champ in champs]
+            except ValueError:
+                valeurs = None
+            if valeurs is None or len(valeurs) != attendu:
+                erreurs.append((numero, f"ligne illisible pour le format {format_fichier} : {ligne.strip()!r}"))
+                continue
+            if format_fichier == "vol":
+                avion, id_vol, t = valeurs
+                if not 1 <= id_vol <= ctx.n_vols:
+                    erreurs.append((numero, f"vol {id_vol} inconnu"))
+                    continue
+                destination = ctx.destination[id_vol]
+            else:
+                avion, destination, t = valeurs if format_fichier == "destination" else (valeurs[0], *valeurs[2:])
+                if not 0 <= destination < ctx.n_destinations:
+                    erreurs.append((numero, f"destination {destination} inconnue"))
+                    continue
+                id_vol = ctx.id_vol(destination, t) if 0 <= t < ctx.Tmax else None
+            if not 0 <= avion < ctx.n_avions:
+                erreurs.append((numero, f"avion {avion} inconnu (flotte de {ctx.n_avions})"))
+                continue
+            vols.append((numero, avion, destination, t, id_vol))
+    return vols, erreurs
+
+
+# Toutes les violations de contraintes, en O(n log n) : tris par avion et par destination
+def verifier_contraintes(vols, ctx):
+    violations = []
+    destinations = ctx.donnees["destinations"]
+
+    # Horizon, et instant de départ du vol (un identifiant ne vole qu'à son instant)
+    for numero, avion, destination, t, id_vol in vols:
+        duree = destinations[destination]["flight_time"]
+        if t < 0 or t + duree > ctx.Tmax:
+            violations.append((numero, f"vol hors horizon : départ {t}, arrivée {t + duree} > {ctx.Tmax}"))
+        if id_vol is not None and ctx.instant[id_vol] != t:
+            violations.append((numero, f"vol {id_vol} planifié à {t} au lieu de son départ {ctx.instant[id_vol]}"))
+
+    # Chevauchement des vols d'un même avion : chaque départ est comparé à la
+    # fin la plus tardive des vols qui le précèdent (pas seulement du dernier)
+    par_avion = defaultdict(list)
+    for vol in vols:
+        par_avion[vol[1]].append(vol)
+    for avion, liste in par_avion.items():
+        liste.sort(key=lambda vol: vol[3])
+        fin, ligne = None, None
+        for vol in liste:
+            if fin is not None and vol[3] < fin:
+                violations.append((vol[0], f"avion {avion} : départ {vol[3]} avant la fin du vol de la ligne {ligne} ({fin})"))
+            arrivee = vol[3] + destinations[vol[2]]["flight_time"]
+            if fin is None or arrivee > fin:
+                fin, ligne = arrivee, vol[0]
+
+    # Créneaux du hub
+    par_instant = defaultdict(list)
+    for vol in vols:
+        par_instant[vol[3]].append(vol[0])
+    for t, lignes in par_instant.items():
+        if 0 <= t < ctx.Tmax and len(lignes) > ctx.slots[t]:
+            violations.append((None, f"instant {t} : {len(lignes)} départs pour {ctx.slots[t]} créneaux "
+                                     f"(lignes {', '.join(map(str, lignes))})"))
+
+    # Nombre de vols par destination
+    par_destination = defaultdict(int)
+    for vol in vols:
+        par_destination[vol[2]] += 1
+    for destination, n_vols in par_destination.items():
+        n_flights = destinations[destination]["n_flights"]
+        if n_vols > n_flights:
+            violations.append((None, f"destination {destination} : {n_vols} vols pour {n_flights} autorisés"))
+
+    # Espacement, au sens du score (SpacingIndex, comme fonction_evaluation) :
+    # l'arrivée d'un vol et le départ d'un autre vol de la même destination
+    # doivent être séparés d'au moins min_spacing, pour tous les formats
+    identifies = [vol for vol in vols if vol[4] is not None]
+    index = SpacingIndex(ctx, [(avion, id_vol, t) for _, avion, _, t, id_vol in identifies])
+    lignes = {(t, id_vol): numero for numero, _, _, t, id_vol in identifies}
+    for numero, _, destination, t, id_vol in identifies:
+        arrivee = t + ctx.duree[id_vol]
+        for autre_t, autre_id in index.voisins(id_vol, t):
+            violations.append((numero, f"destination {destination} : arrivée {arrivee} et départ {autre_t} "
+                                       f"(ligne {lignes[autre_t, autre_id]}) espacés de moins de {ctx.min_spacing}"))
+
+    # Utilisation minimale
+    utilisation = [0] * ctx.n_avions
+    for _, avion, destination, _, _ in vols:
+        utilisation[avion] += destinations[destination]["flight_time"]
+    for avion, temps in enumerate(utilisation):
+        if temps < ctx.min_utilisation * ctx.Tmax:
+            violations.append((None, f"avion {avion} : utilisation {temps} < {ctx.min_utilisation} x {ctx.Tmax}"))
+
+    return violations
+
+
+@lru_cache(maxsize=None)
+def contexte_instance(chemin):
+    return charger_contexte(chemin)
+
+
+def valider_fichier(chemin, instance, format_lignes="auto"):
+    ctx = contexte_instance(instance)
+    vols, erreurs = lire_solution(chemin, ctx, format_lignes)
+    violations = erreurs + verifier_contraintes(vols, ctx)
+    # Score au sens de fonction_evaluation, pour les vols identifiés
+    evalues = [vol for vol in vols if vol[4] is not None]
+    avions = np.array([vol[1] for vol in evalues], dtype=np.int64)
+    ids = np.array([vol[4] for vol in evalues], dtype=np.int64)
+    departs = np.array([vol[3] for vol in evalues], dtype=np.int64)
+    evaluation = evaluer_tableaux(ctx, avions, ids, departs, LAMBDA_ESPACEMENT, LAMBDA_UTILISATION)
+    return chemin, len(vols), violations, evaluation
+
+
+def instance_associee(chemin, dossier_instances):
+    nom = os.path.basename(chemin).replace(".txt", ".json")
+    if nom.startswith("solution-"):
+        nom = "instance-" + nom[len("solution-"):]
+    return os.path.join(dossier_instances, nom)
+
+
+def afficher(resultat):
+    chemin, n_vols, violations, (score, profit, pen_esp, pen_util) = resultat
+    etat = "OK" if not violations else f"{len(violations)} violation(s)"
+    print(f"{chemin} : {n_vols} vols, profit {profit}, score {score} "
+          f"(espacement {pen_esp}, sous-utilisation {pen_util}) -> {etat}")
+    for numero, message in violations:
+        print(f"  {chemin}:{numero}: {message}" if numero is not None else f"  {chemin}: {message}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Valide des fichiers solution face à leur instance.")
+    parser.add_argument("solutions", nargs="+", help="fichiers solution ou dossiers de fichiers solution")
+    parser.add_argument("--instance", help="instance à utiliser pour tous les fichiers")
+    parser.add_argument("--instances", default="Instances", help="dossier des instances (défaut : Instances)")
+    parser.add_argument("--format", default="auto", choices=["auto", "vol", "destination", "milp"])
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="nombre de processus")
+    args = parser.parse_args()
+
+    fichiers = []
+    for chemin in args.solutions:
+        if os.path.isdir(chemin):
+            fichiers += sorted(os.path.join(chemin, nom) for nom in os.listdir(chemin) if nom.endswith(".txt"))
+        else:
+            fichiers.append(chemin)
+    instances = [args.instance or instance_associee(chemin, args.instances) for chemin in fichiers]
+
+    valide = True
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        for resultat in pool.map(valider_fichier, fichiers, instances, [args.format] * len(fichiers)):
+            afficher(resultat)
+            valide = valide and not resultat[2]
+    sys.exit(0 if valide else 1)